@@ -13,4 +13,39 @@ class Config(object):
     SQLALCHEMY_DATABASE_URI = os.environ.get("DATABASE_URL")
     SQLALCHEMY_BINDS = {"queries": os.environ.get("QUERY_DATABASE_URL")}
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Read path used by the Dash apps, see econuy_web/database.py.
+    READ_DATABASE_URL = os.environ.get("READ_DATABASE_URL")
+    READ_POOL_SIZE = int(os.environ.get("READ_POOL_SIZE", 5))
+    READ_MAX_OVERFLOW = int(os.environ.get("READ_MAX_OVERFLOW", 5))
+    READ_POOL_TIMEOUT = float(os.environ.get("READ_POOL_TIMEOUT", 30))
+    READ_POOL_RECYCLE = int(os.environ.get("READ_POOL_RECYCLE", 1800))
+    READ_POOL_PRE_PING = os.environ.get("READ_POOL_PRE_PING", "True") == "True"
+    # Milliseconds, Postgres only.
+    READ_STATEMENT_TIMEOUT = int(os.environ.get("READ_STATEMENT_TIMEOUT", 15000))
+    # Serve read pool statistics at /status/pool. Off by default, the route has no auth.
+    POOL_STATUS_ENABLED = os.environ.get("POOL_STATUS_ENABLED", "False") == "True"
     EXPORT_FOLDER = os.environ.get("EXPORT_FOLDER")
+    # Mount the Dash apps on their first request instead of at startup. They are then served by
+    # their own Flask servers, which share this app's config, hooks, error handlers and
+    # extensions but not its routes, see dash_apps/mount.py.
+    LAZY_DASH = os.environ.get("LAZY_DASH", "False") == "True"
+    CACHE_MAX_BYTES = int(os.environ.get("CACHE_MAX_BYTES", 256 * 1024**2))
+    CACHE_VERSION_TTL = float(os.environ.get("CACHE_VERSION_TTL", 30))
+    TRANSFORM_CACHE_MAX_BYTES = int(os.environ.get("TRANSFORM_CACHE_MAX_BYTES", 128 * 1024**2))
+    REFRESH_WORKERS = int(os.environ.get("REFRESH_WORKERS", os.cpu_count() or 1))
+    MONITOR_WORKERS = int(os.environ.get("MONITOR_WORKERS", 4))
+    SERVER_SIDE_STORES = os.environ.get("SERVER_SIDE_STORES", "False") == "True"
+    # Defaults to a folder in the app's instance path. Must be writable only by the app's user.
+    FRAME_STORE_DIR = os.environ.get("FRAME_STORE_DIR")
+    FRAME_STORE_TTL = float(os.environ.get("FRAME_STORE_TTL", 3600))
+    BACKGROUND_JOBS = os.environ.get("BACKGROUND_JOBS", "False") == "True"
+    # Defaults to a folder in the app's instance path, like FRAME_STORE_DIR.
+    JOBS_DIR = os.environ.get("JOBS_DIR")
+    JOB_WORKERS = int(os.environ.get("JOB_WORKERS", 2))
+    # Seconds a job may wait for a worker before the page gives up on it.
+    JOB_QUEUE_TIMEOUT = float(os.environ.get("JOB_QUEUE_TIMEOUT", 60))
+    # Cells times remaining steps above which a chain without X13 runs goes to the queue.
+    JOB_HEAVY_CELLS = int(os.environ.get("JOB_HEAVY_CELLS", 2_000_000))
+    X13_CACHE_ENABLED = os.environ.get("X13_CACHE_ENABLED", "True") == "True"
+    X13_CACHE_DIR = os.environ.get("X13_CACHE_DIR")
+    X13_CACHE_TTL = float(os.environ.get("X13_CACHE_TTL", 30 * 24 * 3600))
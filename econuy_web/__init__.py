@@ -3,26 +3,45 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_bootstrap import Bootstrap
 
 from config import Config
+from econuy_web.database import read_db
+from econuy_web.frame_store import frame_store, x13_cache
+from econuy_web.jobs import job_queue
 
 
 db = SQLAlchemy()
 bootstrap = Bootstrap()
 
 
-def create_app():
-    """Initialize the core application."""
+def create_app(web: bool = True):
+    """
+    Initialize the core application.
+
+    With ``web=False`` only the database and disk stores are set up, without
+    importing econuy or pandas. Scripts like update.py and the job worker set
+    up the in-memory caches with ``econuy_web.cache.init_caches``.
+    """
     app = Flask(__name__)
     app.config.from_object(Config)
 
     db.init_app(app)
+    read_db.init_app(app)
+    frame_store.init_app(app)
+    x13_cache.init_app(app)
+    job_queue.init_app(app)
+    if not web:
+        return app
+
     bootstrap.init_app(app)
 
     with app.app_context():
-        from econuy_web.dash_apps.visualization import visualization
-        from econuy_web.dash_apps.monitor import monitor
         from econuy_web import routes, update, tasks, clear, errors
-
-        app = visualization.add_dash(app)
-        app = monitor.add_dash(app)
+        from econuy_web.cache import init_caches
+        from econuy_web.dash_apps.mount import LazyDash, mount_all
+
+        init_caches(app)
+        if app.config["LAZY_DASH"]:
+            app.wsgi_app = LazyDash(app)
+        else:
+            app = mount_all(app)
 
         return app
@@ -1,20 +1,40 @@
 import os
 import re
+import sys
+import json
+import time
+import random
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
 from alphacast import Alphacast
+import pandas as pd
+import requests
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
 from econuy.utils import datasets
-from econuy import Session, Pipeline
+from econuy import Session
 from econuy import transform
 
+from econuy_web.cache import CachedPipeline
 from econuy_web.tasks import get_project_root
 
 
 load_dotenv(Path(get_project_root(), ".env"))
 ALPHACAST_API_KEY = os.environ.get("ALPHACAST_API_KEY")
 DATABASE_URL = os.environ.get("DATABASE_URL")
+# Hashes of what was last uploaded for each dataset, used to only send rows that changed.
+FINGERPRINT_DIR = Path(
+    os.environ.get("ALPHACAST_FINGERPRINT_DIR") or Path(get_project_root(), ".alphacast")
+)
+ALPHACAST_WORKERS = int(os.environ.get("ALPHACAST_WORKERS", 4))
+# Requests per second across all upload threads.
+ALPHACAST_RATE = float(os.environ.get("ALPHACAST_RATE", 5))
+ALPHACAST_RETRIES = int(os.environ.get("ALPHACAST_RETRIES", 4))
+ALPHACAST_BACKOFF = float(os.environ.get("ALPHACAST_BACKOFF", 1))
 AREA_TRANSLATIONS = {
     "Actividad económica": "Activity",
     "Precios": "Prices",
@@ -40,10 +60,10 @@ FREQ_TRANSLATIONS = {
     "-": "Daily",
 }
 
-eng = create_engine(DATABASE_URL)
-p = Pipeline(location=eng, download=False)
-
-alphacast = Alphacast(ALPHACAST_API_KEY)
+# Created on first use, so importing this module doesn't connect to anything.
+_engine = None
+_pipeline = None
+_client = None
 PUBLIC_REPO_DESCRIPTION = (
     "This is econuy's (https://econ.uy) public repository. It contains "
     "Uruguayan economy datasets as provided by government sources in a "
@@ -56,162 +76,224 @@ PRIVATE_REPO_DESCRIPTION = (
     "includes indicators like core inflation, custom long-run market labor "
     "data and the commodity price index."
 )
+# Steps that TRANSFORMATIONS entries are built from, called with each step's arguments.
+STEPS = {
+    "convert_gdp": lambda x, **kwargs: transform.convert_gdp(x, pipeline=get_pipeline(), **kwargs),
+    "convert_real": lambda x, **kwargs: transform.convert_real(
+        x, pipeline=get_pipeline(), **kwargs
+    ),
+    "chg_diff": transform.chg_diff,
+    "decompose": transform.decompose,
+}
 TRANSFORMATIONS = {
     "Public sector - Uruguay - Fiscal balance: consolidated public sector (% GDP) - Monthly": {
         "base": "balance_gps",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "Public sector - Uruguay - Fiscal balance: non-financial public sector (% GDP) - Monthly": {
         "base": "balance_nfps",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "Public sector - Uruguay - Fiscal balance: central government-BPS (% GDP) - Monthly": {
         "base": "balance_cg-bps",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "Public sector - Uruguay - Fiscal balance: public enterprises (% GDP) - Monthly": {
         "base": "balance_pe",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "Public sector - Uruguay - Tax revenue by source (real, YoY % chg) - Monthly": {
         "base": "tax_revenue",
-        "transformations": [
-            lambda x: transform.convert_real(x, pipeline=p),
-            lambda x: transform.chg_diff(x, period="inter"),
-        ],
+        "steps": [("convert_real", {}), ("chg_diff", {"period": "inter"})],
     },
     "Public sector - Uruguay - General government debt: by contractual term, residual, currency and residence (% GDP) - Quarterly": {
         "base": "public_debt_gps",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "Public sector - Uruguay - Non-monetary government debt: by contractual term, residual, currency and residence (% GDP) - Quarterly": {
         "base": "public_debt_nfps",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "Public sector - Uruguay - Central bank debt: by contractual term, residual, currency and residence (% GDP) - Quarterly": {
         "base": "public_debt_cb",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "Labor market - Uruguay - Real wages: total, public and private (YoY % chg) - Monthly": {
         "base": "real_wages",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
     "Financial sector - Uruguay - Bank deposits (% GDP) - Monthly": {
         "base": "deposits",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "Financial sector - Uruguay - Bank credits to non-financial sector (% GDP) - Monthly": {
         "base": "credit",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "Prices - Uruguay - Consumer price index - CPI (YoY % chg) - Monthly": {
         "base": "cpi",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
     "Activity - Uruguay - Industrial production: total, ex-refinery and core (YoY % chg) - Monthly": {
         "base": "core_industrial",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
     "Activity - Uruguay - National accounts: supply, constant prices, spliced series (YoY % chg) - Quarterly": {
         "base": "natacc_ind_con_nsa_long",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
     "Activity - Uruguay - National accounts: supply, constant prices, spliced series (YoY % chg) - Quarterly": {
         "base": "natacc_gas_con_nsa_long",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
     "Activity - Uruguay - GDP: real index, seasonally adjusted, spliced series (QoQ % chg) - Quarterly": {
         "base": "gdp_con_idx_sa_long",
-        "transformations": [lambda x: transform.chg_diff(x, period="last")],
+        "steps": [("chg_diff", {"period": "last"})],
     },
     "Activity - Uruguay - GDP: constant prices, spliced series (wp BCU 12-15) (YoY % chg) - Quarterly": {
         "base": "gdp_con_nsa_long",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
     "Prices - Uruguay - CPI: tradable, non-tradable, core and residual (YoY % chg) - Monthly": {
         "base": "cpi_measures",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
     "Prices - Uruguay - CPI: tradable, non-tradable, core and residual (MoM % chg, seasonally adjusted) - Monthly": {
         "base": "cpi_measures",
-        "transformations": [
-            lambda x: transform.chg_diff(x, period="last"),
-            lambda x: transform.decompose(x, component="seas", force_x13=True),
+        "steps": [
+            ("chg_diff", {"period": "last"}),
+            ("decompose", {"component": "seas", "force_x13": True}),
         ],
     },
     "Public sector - Uruguay - Fiscal balance: all aggregations, inc. FSS adjustment (% GDP) - Monthly": {
         "base": "balance_summary",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "Public sector - Uruguay - Net public debt excluding bank deposits (% GDP) - Quarterly": {
         "base": "net_public_debt",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "Labor market - Uruguay - Labor force participation, employment and unemployment: extended series of rates and people (seasonally adjusted) - Monthly": {
         "base": "labor_rates_people",
-        "transformations": [
-            lambda x: transform.decompose(x, component="seas", force_x13=True)
-        ],
+        "steps": [("decompose", {"component": "seas", "force_x13": True})],
     },
     "Labor market - Uruguay - Labor force participation, employment and unemployment: extended series of rates and people (trend-cycle) - Monthly": {
         "base": "labor_rates_people",
-        "transformations": [
-            lambda x: transform.decompose(x, component="trend", force_x13=True)
-        ],
+        "steps": [("decompose", {"component": "trend", "force_x13": True})],
     },
     "External sector - Uruguay - Trade balance by country (% GDP) - Monthly": {
         "base": "trade_balance",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "External sector - Uruguay - Terms of trade (YoY % chg) - Monthly": {
         "base": "terms_of_trade",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
     "External sector - Uruguay - Econuy commodity price index (YoY % chg) - Monthly": {
         "base": "commodity_index",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
     "External sector - Uruguay - Real exchange rates, econuy calculations (YoY % chg) - Monthly": {
         "base": "rxr_custom",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
     "External sector - Uruguay - Balance of payments (% GDP) - Quarterly": {
         "base": "bop",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "External sector - Uruguay - Balance of payments summary and capital flows (% GDP) - Quarterly": {
         "base": "bop_summary",
-        "transformations": [lambda x: transform.convert_gdp(x, pipeline=p)],
+        "steps": [("convert_gdp", {})],
     },
     "Prices - Uruguay - Produce price index - PPI (YoY % chg) - Monthly": {
         "base": "ppi",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
     "Prices - Uruguay - Producer price index - PPI (MoM % chg, seasonally adjusted) - Monthly": {
         "base": "ppi",
-        "transformations": [
-            lambda x: transform.chg_diff(x, period="last"),
-            lambda x: transform.decompose(x, component="seas", force_x13=True),
+        "steps": [
+            ("chg_diff", {"period": "last"}),
+            ("decompose", {"component": "seas", "force_x13": True}),
         ],
     },
     "Prices - Uruguay - CPI by division - CPI (YoY % chg) - Monthly": {
         "base": "cpi_divisions",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
     "Prices - Uruguay - CPI by division - CPI (MoM % chg, seasonally adjusted) - Monthly": {
         "base": "cpi_divisions",
-        "transformations": [
-            lambda x: transform.chg_diff(x, period="last"),
-            lambda x: transform.decompose(x, component="seas", force_x13=True),
+        "steps": [
+            ("chg_diff", {"period": "last"}),
+            ("decompose", {"component": "seas", "force_x13": True}),
         ],
     },
     "Prices - Uruguay - Utilities' price index (YoY % chg) - Monthly": {
         "base": "utilities",
-        "transformations": [lambda x: transform.chg_diff(x, period="inter")],
+        "steps": [("chg_diff", {"period": "inter"})],
     },
 }
 
 
+def get_engine():
+    global _engine
+    if _engine is None:
+        _engine = create_engine(DATABASE_URL)
+    return _engine
+
+
+def get_pipeline() -> CachedPipeline:
+    global _pipeline
+    if _pipeline is None:
+        # Reads go through the data cache, so conversion tables are loaded once per run.
+        _pipeline = CachedPipeline(location=get_engine(), download=False)
+    return _pipeline
+
+
+def get_client() -> Alphacast:
+    global _client
+    if _client is None:
+        _client = Alphacast(ALPHACAST_API_KEY)
+    return _client
+
+
+def build_plan(transformations: Dict[str, Dict]) -> Dict[str, List[Tuple[str, Tuple]]]:
+    """
+    Group ``transformations`` by base dataset, with each entry's steps as hashable tuples.
+
+    Entries with the same base are run together so the base is read once and
+    steps they have in common are computed once.
+    """
+    plan = {}
+    for name, dataset_dict in transformations.items():
+        steps = tuple(
+            (step, tuple(sorted(kwargs.items()))) for step, kwargs in dataset_dict["steps"]
+        )
+        plan.setdefault(dataset_dict["base"], []).append((name, steps))
+    return plan
+
+
+def run_plan(plan: Dict[str, List[Tuple[str, Tuple]]]) -> Iterator[Tuple[str, pd.DataFrame]]:
+    """
+    Yield each transformed dataset in ``plan``, reusing shared step prefixes.
+
+    Intermediate results are kept only while their base is being processed.
+    econuy modifies frames in place, including their metadata, so every step
+    gets a copy of its input and shared results are never changed.
+    """
+    for base, entries in plan.items():
+        p = get_pipeline()
+        p.get(base)
+        results = {(): p.dataset}
+        for name, steps in entries:
+            for n in range(1, len(steps) + 1):
+                if steps[:n] not in results:
+                    step, kwargs = steps[n - 1]
+                    results[steps[:n]] = STEPS[step](
+                        results[steps[: n - 1]].copy(), **dict(kwargs)
+                    )
+            yield name, results[steps].copy()
+
+
 def build_dataset_name(dataset, name_es):
     area_es = dataset.columns[0][1]
     area_en = AREA_TRANSLATIONS[area_es]
@@ -225,8 +307,10 @@ def build_dataset_name(dataset, name_es):
     return f"{area_en} - Uruguay - {name_en} - {freq_trns}"
 
 
-def upload_public_datasets():
-    repo_details = alphacast.repository.create(
+def upload_public_datasets(client: Optional[Alphacast] = None, full: bool = False):
+    client = client or get_client()
+    repo_details = call(
+        client.repository.create,
         "Uruguay Macro (econuy public repo)",
         repo_description=PUBLIC_REPO_DESCRIPTION,
         slug="public-repo",
@@ -235,16 +319,17 @@ def upload_public_datasets():
     )
     repo_id = repo_details["id"]
 
-    s = Session(location=eng, download=False)
+    s = Session(location=get_engine(), download=False)
     s.get_bulk("original")
-    for name, dataset in s.datasets.items():
-        upload_dataset(dataset, name, repo_id)
+    uploads = {name: (dataset, name, None) for name, dataset in s.datasets.items()}
 
-    return
+    return upload_many(uploads, repo_id, client=client, full=full)
 
 
-def upload_private_datasets():
-    repo_details = alphacast.repository.create(
+def upload_private_datasets(client: Optional[Alphacast] = None, full: bool = False):
+    client = client or get_client()
+    repo_details = call(
+        client.repository.create,
         "Uruguay Macro (econuy private repo)",
         repo_description=PRIVATE_REPO_DESCRIPTION,
         slug="private-repo",
@@ -253,21 +338,22 @@ def upload_private_datasets():
     )
     repo_id = repo_details["id"]
 
-    s = Session(location=eng, download=False)
+    s = Session(location=get_engine(), download=False)
     custom_only_uruguay = [
         x
         for x in datasets.custom().keys()
         if not any([y in x for y in ["global", "regional", "lin_gdp"]])
     ]
     s.get(custom_only_uruguay)
-    for name, dataset in s.datasets.items():
-        upload_dataset(dataset, name, repo_id)
+    uploads = {name: (dataset, name, None) for name, dataset in s.datasets.items()}
 
-    return
+    return upload_many(uploads, repo_id, client=client, full=full)
 
 
-def upload_transformed_datasets():
-    repo_details = alphacast.repository.create(
+def upload_transformed_datasets(client: Optional[Alphacast] = None, full: bool = False):
+    client = client or get_client()
+    repo_details = call(
+        client.repository.create,
         "Uruguay Macro (econuy private repo)",
         repo_description=PRIVATE_REPO_DESCRIPTION,
         slug="private-repo",
@@ -276,18 +362,159 @@ def upload_transformed_datasets():
     )
     repo_id = repo_details["id"]
 
-    for name, dataset_dict in TRANSFORMATIONS.items():
-        p.get(dataset_dict["base"])
-        data = p.dataset
-        for transformation in dataset_dict["transformations"]:
-            data = transformation(data)
+    # Transformations share one pipeline, so they run here and only uploads are concurrent.
+    uploads = {}
+    for name, data in run_plan(build_plan(TRANSFORMATIONS)):
         data.columns = data.columns.get_level_values(0)
-        upload_dataset(data, "", repo_id, full_name=name)
+        uploads[name] = (data, "", name)
+
+    return upload_many(uploads, repo_id, client=client, full=full)
+
+
+class RateLimiter(object):
+    """Spaces out calls shared by every upload thread to at most ``rate`` per second."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
+
+rate_limiter = RateLimiter(ALPHACAST_RATE)
+# Status codes in the messages of the Alphacast client's exceptions, e.g. "503: ..." or
+# "API failed with status code 503".
+TRANSIENT_STATUS = re.compile(r"^(?:429|5\d\d):|status code (?:429|5\d\d)\b")
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    Whether a failed call is worth retrying: connection errors, timeouts, 429 and 5xx.
+
+    The Alphacast client raises plain exceptions with the status code in the
+    message, so that is where the status is read from.
+    """
+    if isinstance(
+        error, (requests.ConnectionError, requests.Timeout, ConnectionError, TimeoutError)
+    ):
+        return True
+    response = getattr(error, "response", None)
+    if response is not None and getattr(response, "status_code", None) is not None:
+        return response.status_code == 429 or response.status_code >= 500
+    return bool(TRANSIENT_STATUS.search(str(error)))
+
+
+def call(function: Callable, *args, **kwargs):
+    """
+    Call the Alphacast API through the rate limiter, retrying transient errors with backoff.
+
+    Other errors are raised right away. That includes ``KeyError``, which
+    ``datasets.create`` uses to signal that the dataset must be looked up by
+    name instead.
+    """
+    for attempt in range(ALPHACAST_RETRIES + 1):
+        rate_limiter.wait()
+        try:
+            return function(*args, **kwargs)
+        except Exception as error:
+            if attempt == ALPHACAST_RETRIES or not is_transient(error):
+                raise
+            time.sleep(ALPHACAST_BACKOFF * 2**attempt * (1 + random.random()))
+
+
+def upload_many(
+    uploads: Dict[str, Tuple],
+    repo_id,
+    client: Optional[Alphacast] = None,
+    full: bool = False,
+) -> Dict[str, Dict]:
+    """
+    Upload ``{key: (dataset, name, full_name)}`` concurrently and print a summary.
+
+    Returns the seconds taken and the error, if any, for each upload.
+    """
+
+    def timed_upload(dataset, name, full_name):
+        start = time.perf_counter()
+        try:
+            upload_dataset(dataset, name, repo_id, full_name=full_name, client=client, full=full)
+            error = None
+        except Exception as e:
+            error = repr(e)
+        return {"seconds": time.perf_counter() - start, "error": error}
+
+    with ThreadPoolExecutor(max_workers=ALPHACAST_WORKERS) as pool:
+        futures = {key: pool.submit(timed_upload, *upload) for key, upload in uploads.items()}
+        summary = {key: future.result() for key, future in futures.items()}
+
+    failed = {key: result for key, result in summary.items() if result["error"]}
+    for key, result in sorted(summary.items(), key=lambda x: -x[1]["seconds"]):
+        print(f"{result['seconds']:8.1f}s  {'FAILED' if result['error'] else 'ok':6}  {key}")
+    print(f"{len(summary) - len(failed)} uploaded, {len(failed)} failed.")
+    for key, result in failed.items():
+        print(f"{key}: {result['error']}")
+
+    return summary
+
+
+def row_hashes(data: pd.DataFrame) -> pd.Series:
+    """Hash of each row's date and values, indexed like ``data``."""
+    return pd.util.hash_pandas_object(data, index=False).astype(str)
+
+
+def columns_hash(data: pd.DataFrame) -> str:
+    return hashlib.sha1(json.dumps([str(column) for column in data.columns]).encode()).hexdigest()
+
+
+def fingerprint_path(dataset_name: str) -> Path:
+    return FINGERPRINT_DIR / f"{hashlib.sha1(dataset_name.encode()).hexdigest()}.json"
+
+
+def read_fingerprint(dataset_name: str) -> Optional[Dict]:
+    try:
+        with open(fingerprint_path(dataset_name), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_fingerprint(dataset_name: str, fingerprint: Dict):
+    FINGERPRINT_DIR.mkdir(parents=True, exist_ok=True)
+    path = fingerprint_path(dataset_name)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "w") as f:
+        json.dump(fingerprint, f)
+    os.replace(tmp, path)
 
     return
 
 
-def upload_dataset(dataset, name, repo_id, full_name=None):
+def upload_dataset(
+    dataset,
+    name,
+    repo_id,
+    full_name=None,
+    client: Optional[Alphacast] = None,
+    full: bool = False,
+):
+    """
+    Upload a dataset, sending only rows that changed since the last upload.
+
+    A fingerprint of the columns and of every row is kept in ``FINGERPRINT_DIR``.
+    The whole dataset is uploaded, replacing what Alphacast has, when there is
+    no fingerprint, when the columns changed, when rows were removed or when
+    ``full`` is set. Otherwise only new and changed rows are sent. ``client``
+    defaults to the module's Alphacast client and can be any object with the
+    same ``datasets`` interface.
+    """
+    client = client or get_client()
     aux = dataset.copy()
     if full_name is None:
         dataset_name = build_dataset_name(aux, name)
@@ -297,21 +524,64 @@ def upload_dataset(dataset, name, repo_id, full_name=None):
     aux.insert(0, column="country", value="Uruguay")
     aux.reset_index(inplace=True)
     aux.rename(columns={"index": "Date"}, inplace=True)
+    aux["Date"] = pd.to_datetime(aux["Date"])
+
+    dates = aux["Date"].dt.strftime("%Y-%m-%d")
+    hashes = row_hashes(aux)
+    fingerprint = {"columns": columns_hash(aux), "rows": dict(zip(dates, hashes))}
+    previous = None if full else read_fingerprint(dataset_name)
+    if previous is not None and previous["columns"] == fingerprint["columns"]:
+        if set(previous["rows"]) - set(fingerprint["rows"]):
+            previous = None
+        else:
+            # A mask over aux's own rows, so it lines up even when dates repeat.
+            changed = dates.map(previous["rows"]) != hashes
+            if not changed.any():
+                print(f"{dataset_name}: no changes, skipping upload.")
+                return
+    else:
+        previous = None
+
     try:
-        dataset_details = alphacast.datasets.create(dataset_name, repo_id, returnIdIfExists=True)
+        dataset_details = call(
+            client.datasets.create, dataset_name, repo_id, returnIdIfExists=True
+        )
         dataset_id = dataset_details["id"]
     except KeyError:
-        dataset_id = alphacast.datasets.read_by_name(dataset_name)["id"]
-    alphacast.datasets.dataset(dataset_id).initialize_columns(
-        dateColumnName="Date", entitiesColumnNames=["country"], dateFormat="%Y-%m-%d"
-    )
-    alphacast.datasets.dataset(dataset_id).upload_data_from_df(
-        aux, deleteMissingFromDB=True, onConflictUpdateDB=True, uploadIndex=False
-    )
+        dataset_id = call(client.datasets.read_by_name, dataset_name)["id"]
+    if previous is None:
+        call(
+            client.datasets.dataset(dataset_id).initialize_columns,
+            dateColumnName="Date",
+            entitiesColumnNames=["country"],
+            dateFormat="%Y-%m-%d",
+        )
+        call(
+            client.datasets.dataset(dataset_id).upload_data_from_df,
+            aux,
+            deleteMissingFromDB=True,
+            onConflictUpdateDB=True,
+            uploadIndex=False,
+        )
+        print(f"{dataset_name}: uploaded {len(aux)} rows.")
+    else:
+        call(
+            client.datasets.dataset(dataset_id).upload_data_from_df,
+            aux.loc[changed],
+            deleteMissingFromDB=False,
+            onConflictUpdateDB=True,
+            uploadIndex=False,
+        )
+        print(f"{dataset_name}: uploaded {changed.sum()} of {len(aux)} rows.")
+    write_fingerprint(dataset_name, fingerprint)
     return
 
 
 if __name__ == "__main__":
-    upload_public_datasets()
-    upload_private_datasets()
-    upload_transformed_datasets()
+    # "full" re-uploads every dataset regardless of fingerprints.
+    full = "full" in sys.argv[1:]
+    failed = 0
+    for upload in [upload_public_datasets, upload_private_datasets, upload_transformed_datasets]:
+        failed += sum(bool(result["error"]) for result in upload(full=full).values())
+    if failed:
+        sys.exit(f"{failed} uploads failed.")
@@ -0,0 +1,206 @@
+import sys
+import os
+
+# Add the path to the directory containing your project
+project_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.append(project_path)
+
+import json
+import time
+import platform
+import subprocess
+import tempfile
+import datetime as dt
+from collections import defaultdict
+from typing import Dict, List
+
+
+# Number of slowest modules kept from the -X importtime report.
+TOP_IMPORTS = 40
+
+
+def rss_bytes() -> int:
+    """Current resident memory of this process, or its peak where /proc is not available."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure_create_app() -> Dict:
+    start = time.perf_counter()
+    from econuy_web import create_app
+
+    imported = time.perf_counter()
+    app = create_app()
+    end = time.perf_counter()
+    return {
+        "import_seconds": imported - start,
+        "create_app_seconds": end - imported,
+        "total_seconds": end - start,
+        "rss_bytes": rss_bytes(),
+        "lazy_dash": app.config["LAZY_DASH"],
+    }
+
+
+def measure_dash_apps() -> Dict:
+    """
+    Import and callback registration time of each Dash app, on top of the bare app.
+
+    The first app in ``DASH_APPS`` also pays for importing dash, plotly, pandas and econuy.
+    """
+    import importlib
+    from flask import Flask
+    from econuy_web import create_app
+    from econuy_web.dash_apps.mount import DASH_APPS
+
+    app = create_app(web=False)
+    results = {"base_rss_bytes": rss_bytes()}
+    with app.app_context():
+        for prefix, module_name in DASH_APPS.items():
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            imported = time.perf_counter()
+            server = Flask(app.import_name)
+            server.config.from_mapping(app.config)
+            module.add_dash(server)
+            end = time.perf_counter()
+            results[prefix] = {
+                "import_seconds": imported - start,
+                "register_seconds": end - imported,
+                "rss_bytes": rss_bytes(),
+            }
+    return results
+
+
+MEASUREMENTS = {"create_app": measure_create_app, "dash_apps": measure_dash_apps}
+
+
+def run_child(name: str) -> Dict:
+    """Run a measurement in a fresh interpreter, so nothing is imported beforehand."""
+    fd, path = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), f"--child={name}", f"--output={path}"],
+            cwd=project_path,
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        with open(path, "r") as f:
+            return json.load(f)
+    finally:
+        os.unlink(path)
+
+
+def import_times() -> Dict[str, List]:
+    """Per-module import cost of create_app, parsed from ``python -X importtime``."""
+    code = (
+        f"import sys; sys.path.insert(0, {project_path!r}); "
+        "from econuy_web import create_app; create_app()"
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=project_path,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    modules = []
+    packages = defaultdict(int)
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        if not self_us.strip().isdigit():
+            continue
+        module = module.strip()
+        modules.append(
+            {"module": module, "self_us": int(self_us), "cumulative_us": int(cumulative_us)}
+        )
+        packages[module.split(".")[0]] += int(self_us)
+    modules.sort(key=lambda x: -x["cumulative_us"])
+    return {
+        "total_us": sum(packages.values()),
+        "packages": dict(sorted(packages.items(), key=lambda x: -x[1])),
+        "slowest": modules[:TOP_IMPORTS],
+    }
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=project_path,
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def bench(repeat: int = 3) -> Dict:
+    """
+    Measure worker start-up.
+
+    Timings are the fastest of ``repeat`` runs, each in a fresh interpreter.
+    Memory is the resident size after the run. The settings that change
+    start-up, ``LAZY_DASH`` and ``GUNICORN_PRELOAD``, are recorded with the
+    results so runs can be compared like for like.
+    """
+    create_app_runs = [run_child("create_app") for _ in range(repeat)]
+    dash_runs = [run_child("dash_apps") for _ in range(repeat)]
+    fastest = min(create_app_runs, key=lambda x: x["total_seconds"])
+    dash_apps = {}
+    for prefix in [key for key in dash_runs[0] if key != "base_rss_bytes"]:
+        dash_apps[prefix] = min(
+            [run[prefix] for run in dash_runs],
+            key=lambda x: x["import_seconds"] + x["register_seconds"],
+        )
+    return {
+        "timestamp": dt.datetime.now(dt.timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "repeat": repeat,
+        "settings": {
+            "LAZY_DASH": fastest["lazy_dash"],
+            # Read by gunicorn.conf.py, which isn't loaded here.
+            "GUNICORN_PRELOAD": os.environ.get("GUNICORN_PRELOAD", "True") == "True",
+        },
+        "create_app": fastest,
+        "dash_apps": dash_apps,
+        "base_rss_bytes": min(run["base_rss_bytes"] for run in dash_runs),
+        "imports": import_times(),
+    }
+
+
+if __name__ == "__main__":
+    options = dict(arg.lstrip("-").split("=", 1) for arg in sys.argv[1:] if "=" in arg)
+    if "child" in options:
+        with open(options["output"], "w") as f:
+            json.dump(MEASUREMENTS[options["child"]](), f)
+        sys.exit(0)
+    output = options.get("output") or f"bench-{dt.datetime.now():%Y%m%d-%H%M%S}.json"
+    results = bench(repeat=int(options.get("repeat", 3)))
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(", ".join(f"{key}={value}" for key, value in results["settings"].items()))
+    print(
+        f"create_app: {results['create_app']['total_seconds']:.2f}s "
+        f"({results['create_app']['rss_bytes'] / 1024**2:.0f} MB)"
+    )
+    for prefix, result in results["dash_apps"].items():
+        print(
+            f"{prefix}: import {result['import_seconds']:.2f}s, "
+            f"register {result['register_seconds']:.3f}s"
+        )
+    print(f"imports: {results['imports']['total_us'] / 1e6:.2f}s. Results written to {output}.")
@@ -0,0 +1,316 @@
+import sys
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, Iterable, Optional, Union
+
+import pandas as pd
+from econuy import Pipeline, Session
+from econuy.utils import sql as sqlutil
+from sqlalchemy import inspect
+from sqlalchemy.engine.base import Connection, Engine
+from sqlalchemy.exc import SQLAlchemyError
+
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_TABLE = "econuy_web_versions"
+# Tables read by econuy's convert_* functions, see transform.convert_usd/real/gdp.
+CONVERSION_TABLES = {
+    "usd": "nxr_monthly",
+    "real": "cpi",
+    "gdp": "_monthly_interpolated_gdp",
+}
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    """Approximate in-memory size of a dataframe, including its index and column labels."""
+    return int(df.memory_usage(deep=True, index=True).sum()) + sys.getsizeof(df.columns)
+
+
+def frame_digest(df: pd.DataFrame) -> str:
+    """Hash of a dataframe's values, index and column labels."""
+    digest = hashlib.sha1(pd.util.hash_pandas_object(df, index=True).values)
+    digest.update(repr(df.columns.tolist()).encode())
+    return digest.hexdigest()
+
+
+class LRUCache(object):
+    """Thread-safe least-recently-used cache bounded by the total size of its values."""
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024**2,
+        sizeof: Callable = frame_nbytes,
+        config_key: Optional[str] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.config_key = config_key
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        if self.config_key:
+            self.max_bytes = app.config.get(self.config_key, self.max_bytes)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable):
+        return key in self._entries
+
+    def get(self, key: Hashable, default=None):
+        with self._lock:
+            try:
+                value, _ = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.nbytes -= evicted_size
+
+    def pop(self, key: Hashable):
+        with self._lock:
+            if key in self._entries:
+                self.nbytes -= self._entries.pop(key)[1]
+
+    def pop_matching(self, predicate: Callable[[Hashable], bool]):
+        with self._lock:
+            for key in [k for k in self._entries if predicate(k)]:
+                self.nbytes -= self._entries.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.nbytes = 0
+
+
+class DataCache(LRUCache):
+    """
+    Process-wide read-through cache for dataset tables.
+
+    Entries are keyed by table name and column selection, and tagged with the
+    version of the table they were read at. Versions are written to
+    ``VERSIONS_TABLE`` by ``update.py`` each time a table is rewritten, and are
+    polled from the database at most once every ``version_ttl`` seconds, so a
+    refresh invalidates every worker's copy shortly after it finishes.
+
+    Cached frames are never handed out directly. Callers get a copy they are
+    free to modify in place, which is what most callbacks and econuy's
+    transformations do.
+    """
+
+    def __init__(self, max_bytes: int = 256 * 1024**2, version_ttl: float = 30):
+        super().__init__(max_bytes=max_bytes, sizeof=lambda value: frame_nbytes(value[1]))
+        self.version_ttl = version_ttl
+        self._versions = {}
+        self._versions_checked = -float("inf")
+
+    def init_app(self, app):
+        self.max_bytes = app.config.get("CACHE_MAX_BYTES", self.max_bytes)
+        self.version_ttl = app.config.get("CACHE_VERSION_TTL", self.version_ttl)
+
+    def version(self, con: Union[Connection, Engine], table_name: str) -> Optional[str]:
+        now = time.monotonic()
+        if now - self._versions_checked > self.version_ttl:
+            self._versions = read_versions(con)
+            self._versions_checked = now
+        return self._versions.get(table_name)
+
+    def read(
+        self,
+        con: Union[Connection, Engine],
+        table_name: str,
+        cols: Union[str, Iterable[str], None] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """
+        Drop-in replacement for ``sqlutil.read`` that serves repeated reads from memory.
+
+        The whole table is cached and date windows are sliced from it, so
+        reads of different windows share one entry instead of each taking
+        their own slot.
+        """
+        if cols is None or cols == "*":
+            cols_key = "*"
+        elif isinstance(cols, str):
+            cols_key = (cols,)
+        else:
+            cols_key = tuple(cols)
+        data = self.get_or_load(
+            con,
+            table_name,
+            (table_name, cols_key),
+            lambda: sqlutil.read(
+                con=con,
+                table_name=table_name,
+                cols=None if cols_key == "*" else list(cols_key),
+            ),
+        )
+        if start_date is not None:
+            data = data.loc[data.index >= start_date]
+        if end_date is not None:
+            data = data.loc[data.index <= end_date]
+        return data
+
+    def get_or_load(
+        self,
+        con: Union[Connection, Engine],
+        table_name: str,
+        key: Hashable,
+        loader: Callable[[], pd.DataFrame],
+    ) -> pd.DataFrame:
+        version = self.version(con, table_name)
+        cached = self.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1].copy()
+        data = loader()
+        self.set(key, (version, data))
+        return data.copy()
+
+    def invalidate(self, table_names: Iterable[str]):
+        table_names = set(table_names)
+        self.pop_matching(lambda key: key[0] in table_names)
+
+
+class ConversionTables(object):
+    """
+    Per-worker copies of the exchange rate, CPI and GDP tables used for conversions.
+
+    Every currency, inflation or GDP conversion in the visualizer, the monitor
+    and the Alphacast job reads one of these few small tables. They are kept
+    here instead of in ``data_cache`` so that large datasets never evict them,
+    and are reloaded only when ``update.py`` bumps their version. econuy sets
+    metadata on these frames in place, so callers always get a copy.
+    """
+
+    def __init__(self, tables: Iterable[str]):
+        self.tables = set(tables)
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def __contains__(self, table_name: str):
+        return table_name in self.tables
+
+    def read(self, con: Union[Connection, Engine], table_name: str) -> pd.DataFrame:
+        version = data_cache.version(con, table_name)
+        with self._lock:
+            cached = self._frames.get(table_name)
+        if cached is None or cached[0] != version:
+            data = sqlutil.read(con=con, table_name=table_name)
+            cached = (version, data)
+            with self._lock:
+                self._frames[table_name] = cached
+        return cached[1].copy()
+
+    def invalidate(self, table_names: Iterable[str]):
+        with self._lock:
+            for table_name in table_names:
+                self._frames.pop(table_name, None)
+
+
+data_cache = DataCache()
+conversion_tables = ConversionTables(CONVERSION_TABLES.values())
+# Intermediate results of the visualizer's transformation chains, see
+# dash_apps/visualization/transformations.py.
+transform_cache = LRUCache(max_bytes=128 * 1024**2, config_key="TRANSFORM_CACHE_MAX_BYTES")
+
+
+def init_caches(app):
+    """
+    Configure the caches from ``app``.
+
+    Not done by ``create_app(web=False)``, so that it doesn't import econuy;
+    scripts that use the caches call this themselves.
+    """
+    data_cache.init_app(app)
+    transform_cache.init_app(app)
+
+
+def read_versions(con: Union[Connection, Engine]) -> Dict[str, str]:
+    if not inspect(con).has_table(VERSIONS_TABLE):
+        return {}
+    versions = pd.read_sql(sql=VERSIONS_TABLE, con=con)
+    return dict(zip(versions["name"], versions["version"]))
+
+
+def bump_versions(con: Union[Connection, Engine], table_names: Iterable[str]):
+    """Mark tables as rewritten so that every worker's cached copy is discarded."""
+    table_names = list(table_names)
+    versions = read_versions(con)
+    stamp = str(time.time_ns())
+    versions.update({name: stamp for name in table_names})
+    pd.DataFrame({"name": list(versions.keys()), "version": list(versions.values())}).to_sql(
+        name=VERSIONS_TABLE, con=con, if_exists="replace", index=False
+    )
+    data_cache.invalidate(table_names)
+    conversion_tables.invalidate(table_names)
+    data_cache._versions_checked = -float("inf")
+
+    return
+
+
+class CachedPipeline(Pipeline):
+    """
+    ``Pipeline`` whose database reads go through ``data_cache``.
+
+    Tables that can't be served from the cache, because they are missing,
+    empty or can't be read, fall back to econuy's own ``get``.
+    """
+
+    def get(self, name: str):
+        if self.download or not isinstance(self.location, (Connection, Engine)):
+            return super().get(name)
+        try:
+            if name in conversion_tables:
+                data = conversion_tables.read(con=self.location, table_name=name)
+            else:
+                data = data_cache.read(con=self.location, table_name=name)
+        except (SQLAlchemyError, ValueError, KeyError) as error:
+            logger.warning("Could not read %s through the cache: %r", name, error)
+            return super().get(name)
+        if data.empty:
+            return super().get(name)
+        # Pipeline has no public setter, these are the attributes its own get() sets.
+        self._dataset = data
+        self._name = name
+        return
+
+
+class CachedSession(Session):
+    """``Session`` whose database reads go through ``data_cache``."""
+
+    @property
+    def pipeline(self) -> CachedPipeline:
+        # Same arguments as Session.pipeline, so Session attributes are passed down.
+        return CachedPipeline(
+            location=self.location,
+            download=self.download,
+            always_save=self.always_save,
+            read_fmt=self.read_fmt,
+            read_header=self.read_header,
+            save_fmt=self.save_fmt,
+            save_header=self.save_header,
+            errors=self.errors,
+        )
@@ -0,0 +1,154 @@
+import re
+import json
+import threading
+from typing import Dict, List, Optional, Union
+
+import pandas as pd
+from econuy.utils.operations import DATASETS
+from sqlalchemy import inspect, text
+from sqlalchemy.engine.base import Connection, Engine
+
+from econuy_web.cache import data_cache
+
+
+CATALOG_TABLE = "econuy_web_catalog"
+LIST_FIELDS = ["indicators", "units", "currencies"]
+
+_catalog = None
+_catalog_version = None
+_catalog_lock = threading.Lock()
+
+
+def clean_label(description: str) -> str:
+    return re.sub(r" \(([^)]+)\)$", "", description)
+
+
+def clean_option(description: str) -> str:
+    return re.sub(r"\([A-z0-9\-\,\s]+\)", "", description).strip()
+
+
+def base_entry(name: str, metadata: Dict) -> Dict:
+    return {
+        "name": name,
+        "description": metadata["description"],
+        "label": clean_label(metadata["description"]),
+        "option": clean_option(metadata["description"]),
+        "auxiliary": bool(metadata["auxiliary"]),
+        "indicators": [],
+        "units": [],
+        "currencies": [],
+        "frequency": None,
+        "area": None,
+        "rows": 0,
+        "start": None,
+        "end": None,
+    }
+
+
+def build_catalog(con: Engine) -> pd.DataFrame:
+    """Summarize every enabled dataset from its metadata table and date index."""
+    tables = set(inspect(con).get_table_names())
+    entries = []
+    for name, metadata in DATASETS.items():
+        if metadata["disabled"]:
+            continue
+        entry = base_entry(name, metadata)
+        if name in tables and f"{name}_metadata" in tables:
+            columns = pd.read_sql(sql=f"{name}_metadata", con=con, index_col="index")
+            with con.connect() as conn:
+                rows, start, end = conn.execute(
+                    text(f'SELECT COUNT(*), MIN("index"), MAX("index") FROM "{name}"')
+                ).one()
+            entry.update(
+                {
+                    "indicators": columns["Indicador"].tolist(),
+                    "units": columns["Unidad"].unique().tolist(),
+                    "currencies": columns["Moneda"].unique().tolist(),
+                    "frequency": columns["Frecuencia"].iloc[0],
+                    "area": columns["Área"].iloc[0],
+                    "rows": int(rows),
+                    "start": pd.Timestamp(start).strftime("%Y-%m-%d") if start else None,
+                    "end": pd.Timestamp(end).strftime("%Y-%m-%d") if end else None,
+                }
+            )
+        entries.append(entry)
+    catalog = pd.DataFrame(entries)
+    for field in LIST_FIELDS:
+        catalog[field] = catalog[field].apply(json.dumps)
+
+    return catalog
+
+
+def write_catalog(con: Engine):
+    build_catalog(con).to_sql(name=CATALOG_TABLE, con=con, if_exists="replace", index=False)
+
+    return
+
+
+def read_catalog(con: Union[Connection, Engine]) -> Dict[str, Dict]:
+    if not inspect(con).has_table(CATALOG_TABLE):
+        return {
+            name: base_entry(name, metadata)
+            for name, metadata in DATASETS.items()
+            if not metadata["disabled"]
+        }
+    catalog = pd.read_sql(sql=CATALOG_TABLE, con=con)
+    for field in LIST_FIELDS:
+        catalog[field] = catalog[field].apply(json.loads)
+    catalog = catalog.astype(object).where(catalog.notna(), None)
+    return {entry["name"]: entry for entry in catalog.to_dict("records")}
+
+
+def get_catalog(con: Union[Connection, Engine]) -> Dict[str, Dict]:
+    """
+    Per-worker copy of the dataset catalog.
+
+    The catalog is read once and reloaded only after ``update.py`` bumps its
+    version, so lookups never touch the underlying datasets.
+    """
+    global _catalog, _catalog_version
+    version = data_cache.version(con, CATALOG_TABLE)
+    with _catalog_lock:
+        if _catalog is None or version != _catalog_version:
+            _catalog = read_catalog(con)
+            _catalog_version = version
+        return _catalog
+
+
+def table_options(con: Union[Connection, Engine]) -> Dict[str, str]:
+    return {
+        name: entry["option"] for name, entry in get_catalog(con).items() if not entry["auxiliary"]
+    }
+
+
+def indicators(con: Union[Connection, Engine], table: str) -> List[str]:
+    return get_catalog(con).get(table, {}).get("indicators", [])
+
+
+def labels(con: Union[Connection, Engine], tables: List[str]) -> List[str]:
+    """Labels for ``tables``, falling back to the table name for tables not in the catalog."""
+    catalog = get_catalog(con)
+    return [catalog.get(table, {}).get("label") or table for table in tables]
+
+
+def read_frequency(con: Union[Connection, Engine], table: str) -> Optional[str]:
+    if not inspect(con).has_table(f"{table}_metadata"):
+        return None
+    columns = pd.read_sql(sql=f"{table}_metadata", con=con, index_col="index")
+    return columns["Frecuencia"].iloc[0] if len(columns) else None
+
+
+def frequency(con: Union[Connection, Engine], table: str) -> Optional[str]:
+    """
+    Frequency of ``table``.
+
+    Read from the table's metadata when the catalog doesn't have it, e.g.
+    before ``update.py`` has written the catalog for the first time.
+    """
+    entry = get_catalog(con).get(table)
+    if entry is not None and entry["frequency"]:
+        return entry["frequency"]
+    freq = read_frequency(con, table)
+    if entry is not None:
+        entry["frequency"] = freq
+    return freq
@@ -3,6 +3,6 @@ from econuy_web.tasks import clear_tables
 
 
 if __name__ == "__main__":
-    app = create_app()
+    app = create_app(web=False)
     app.app_context().push()
     clear_tables(db.get_engine(bind="queries"))
@@ -0,0 +1,257 @@
+import json
+import base64
+import hashlib
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+import plotly.graph_objects as go
+from plotly.colors import qualitative
+from dash.dependencies import Input, Output
+from dash.exceptions import PreventUpdate
+
+from econuy_web.cache import LRUCache
+
+
+# Total number of points (rows x columns) above which traces are drawn with WebGL.
+WEBGL_POINTS = 5000
+# Used when the browser has not reported its width yet.
+DEFAULT_WIDTH = 1200
+POINTS_PER_PIXEL = 2
+
+# Values are sent to the browser with this many significant digits.
+DISPLAY_DIGITS = 6
+
+# Standalone HTML exports, keyed by a hash of the figure.
+html_cache = LRUCache(max_bytes=32 * 1024**2, sizeof=len)
+
+
+def _register_templates():
+    econuy = go.layout.Template(pio.templates["plotly_white"])
+    econuy.layout.update(
+        {
+            "colorway": qualitative.Bold,
+            "margin": {"l": 20, "r": 20},
+            "legend": {
+                "orientation": "h",
+                "yanchor": "top",
+                "y": -0.1,
+                "xanchor": "left",
+                "x": 0,
+            },
+            "title": {"y": 0.9, "yanchor": "top", "font": {"size": 16}},
+        }
+    )
+    pio.templates["econuy"] = econuy
+
+    logo = Path(__file__).parents[1] / "static" / "cards.jpg"
+    source = "data:image/jpeg;base64," + base64.b64encode(logo.read_bytes()).decode()
+    econuy_logo = go.layout.Template(econuy)
+    econuy_logo.layout.images = [
+        {
+            "source": source,
+            "sizex": 0.1,
+            "sizey": 0.1,
+            "xanchor": "right",
+            "yanchor": "bottom",
+            "xref": "paper",
+            "yref": "paper",
+            "x": 1,
+            "y": 1.01,
+        }
+    ]
+    pio.templates["econuy_logo"] = econuy_logo
+
+
+_register_templates()
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    Returns the positions of ``n_out`` points that preserve the visual shape of
+    the series, including its peaks and troughs. ``x`` must be sorted and
+    neither array may contain NaN.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    every = (n - 2) / (n_out - 2)
+    indices = np.empty(n_out, dtype="int64")
+    indices[0] = 0
+    indices[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+def downsample(data: pd.DataFrame, n_out: int) -> pd.DataFrame:
+    """
+    Keep the rows selected by LTTB for any column.
+
+    Each column is downsampled on its own non-missing values and the union of
+    the selected rows is kept, so every column keeps its shape and the frame
+    keeps a single shared index.
+    """
+    if len(data) <= n_out:
+        return data
+    if isinstance(data.index, pd.DatetimeIndex):
+        x = data.index.asi8.astype("float64")
+    else:
+        x = np.arange(len(data), dtype="float64")
+    keep = []
+    for column in range(data.shape[1]):
+        values = data.iloc[:, column].to_numpy(dtype="float64")
+        positions = np.flatnonzero(~np.isnan(values))
+        keep.append(positions[lttb(x[positions], values[positions], n_out)])
+    return data.iloc[np.unique(np.concatenate(keep))]
+
+
+def max_points(width: Optional[float] = None) -> int:
+    return int((width or DEFAULT_WIDTH) * POINTS_PER_PIXEL)
+
+
+def prepare(data: pd.DataFrame, width: Optional[float] = None) -> Tuple[pd.DataFrame, str]:
+    """
+    Downsample ``data`` to the chart width and pick the trace render mode.
+
+    Returns the data to plot and either ``"webgl"`` or ``"svg"``.
+    """
+    data = downsample(data, max_points(width))
+    render_mode = "webgl" if data.size > WEBGL_POINTS else "svg"
+    return data, render_mode
+
+
+def round_values(values: np.ndarray, digits: int = DISPLAY_DIGITS) -> np.ndarray:
+    """Round to ``digits`` significant digits so values serialize to short JSON numbers."""
+    values = np.asarray(values, dtype="float64")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        magnitude = np.floor(np.log10(np.abs(values)))
+    scale = np.power(10.0, digits - 1 - np.where(np.isfinite(magnitude), magnitude, 0))
+    return np.round(values * scale) / scale
+
+
+def _dates(index: pd.Index):
+    if isinstance(index, pd.DatetimeIndex) and (index == index.normalize()).all():
+        return index.strftime("%Y-%m-%d").to_numpy()
+    return index.to_numpy()
+
+
+def _year_periods(index: pd.DatetimeIndex) -> np.ndarray:
+    freq = pd.infer_freq(index)
+    if freq in ["M", "MS", "Q", "Q-DEC"]:
+        return index.month_name().to_numpy()
+    elif freq in ["A", "A-DEC"]:
+        raise PreventUpdate
+    elif freq in ["W", "W-SUN"]:
+        return index.strftime("%U").astype("int32").to_numpy()
+    return index.dayofyear.to_numpy()
+
+
+def build_figure(
+    data: pd.DataFrame,
+    kind: str = "line",
+    y: Optional[Sequence] = None,
+    title: str = "",
+    yaxis_title: str = "",
+    render_mode: str = "svg",
+    barmode: str = "relative",
+    groupnorm: Optional[str] = None,
+    template: str = "econuy",
+    **layout,
+) -> go.Figure:
+    """
+    Build a figure straight from the columns of a wide dataframe.
+
+    ``kind`` is one of "line", "bar", "area" or "lineyears", the last one
+    drawing one line per year against the period within the year. Extra
+    keyword arguments are set on the layout.
+    """
+    columns = data.columns if y is None else y
+    scatter = go.Scattergl if render_mode == "webgl" else go.Scatter
+    traces = []
+    if kind == "lineyears":
+        periods = _year_periods(data.index)
+        years = data.index.year.to_numpy()
+        for i, year in enumerate(np.unique(years)):
+            mask = years == year
+            color = qualitative.Bold[i % len(qualitative.Bold)]
+            for j, column in enumerate(columns):
+                traces.append(
+                    scatter(
+                        x=periods[mask],
+                        y=round_values(data[column].to_numpy()[mask]),
+                        name=str(year),
+                        legendgroup=str(year),
+                        showlegend=j == 0,
+                        mode="lines",
+                        line={"color": color},
+                        hovertemplate=f"{column}<br>%{{x}}: %{{y}}<extra>{year}</extra>",
+                    )
+                )
+    else:
+        x = _dates(data.index)
+        for column in columns:
+            values = round_values(data[column].to_numpy())
+            if kind == "bar":
+                traces.append(go.Bar(x=x, y=values, name=str(column)))
+            elif kind == "area":
+                traces.append(
+                    go.Scatter(
+                        x=x,
+                        y=values,
+                        name=str(column),
+                        mode="lines",
+                        stackgroup="one",
+                        groupnorm=groupnorm,
+                    )
+                )
+            else:
+                traces.append(scatter(x=x, y=values, name=str(column), mode="lines"))
+
+    fig = go.Figure(data=traces)
+    fig.update_layout(
+        template=template,
+        title=title,
+        yaxis_title=yaxis_title,
+        barmode=barmode,
+        **layout,
+    )
+    return fig
+
+
+def register_viewport_callback(app):
+    """Report the browser width to the ``viewport-width`` store once per page load."""
+    app.clientside_callback(
+        "function(href) { return window.innerWidth; }",
+        Output("viewport-width", "data"),
+        [Input("url", "href")],
+    )
+
+
+def standalone_html(figure: Dict) -> str:
+    """
+    Standalone HTML for a figure, loading plotly.js from its CDN.
+
+    Only built when the chart is copied, and cached so that copying the same
+    chart again is free.
+    """
+    key = hashlib.sha1(json.dumps(figure, sort_keys=True).encode()).hexdigest()
+    html = html_cache.get(key)
+    if html is None:
+        html = pio.to_html(figure, include_plotlyjs="cdn", full_html=True, validate=False)
+        html_cache.set(key, html)
+    return html
@@ -1,22 +1,30 @@
+import logging
 import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
 from typing import Sequence
 
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 
 from dash.dependencies import Input, Output, State
-from econuy import Pipeline
-from econuy import Session
-from econuy.utils import sql as sqlutil
 from flask import current_app
 
+from econuy_web.dash_apps import figures
 from econuy_web.dash_apps.querystrings import encode_state, parse_state
-from econuy_web.dash_apps.monitor.components import build_layout
+from econuy_web.dash_apps.monitor.components import build_layout, default_layout
+from econuy_web.dash_apps.monitor.charts import CHARTS
+from econuy_web.dash_apps.monitor.series import get_many
+
+
+logger = logging.getLogger(__name__)
 
 
 def register_callbacks(app):
-    from econuy_web import db
+    from econuy_web.database import read_db
+
+    figures.register_viewport_callback(app)
+
+    chart_pool = ThreadPoolExecutor(max_workers=current_app.config["MONITOR_WORKERS"])
 
     @app.callback(
         Output("navbar-collapse", "is_open"),
@@ -51,538 +59,47 @@ def register_callbacks(app):
         if not href:
             return []
         state = parse_state(href)
+        if not state:
+            return default_layout()
         return build_layout(state)
 
     @app.callback(
-        Output("chart-demand", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_demand(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("national_accounts_demand_constant_nsa_extended")
-        # p.chg_diff(period="inter")
-        demand = p.dataset
-        demand.columns = demand.columns.get_level_values(0)
-        demand = (
-            demand.div(demand["Producto bruto interno"], axis=0)
-            .shift(4)
-            .mul(demand.pct_change(4), axis=0)
-            * 100
-        )
-        demand["Importaciones de bienes y servicios"] = (
-            demand["Importaciones de bienes y servicios"] * -1
-        )
-        demand_plot = build_chart(
-            demand,
-            y=[
-                "Gasto de consumo: hogares",
-                "Gasto de consumo: gobierno y ISFLH",
-                "Formación bruta de capital",
-                "Exportaciones de bienes y servicios",
-                "Importaciones de bienes y servicios",
-            ],
-            title="Cuentas nacionales, demanda",
-            subtitle="Contribución al crecimiento interanual",
-            kind="bar",
-            start=start,
-            end=end,
-            extra_trace="Producto bruto interno",
-        )
-        return demand_plot
-
-    @app.callback(
-        Output("chart-supply", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_supply(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("national_accounts_supply_constant_nsa_extended")
-        # p.chg_diff(period="inter")
-        supply = p.dataset
-        supply.columns = supply.columns.get_level_values(0)
-        supply = (
-            supply.div(supply["Producto bruto interno"], axis=0)
-            .shift(4)
-            .mul(supply.pct_change(4), axis=0)
-            * 100
-        )
-        supply_plot = build_chart(
-            supply,
-            y=supply.columns[:-1],
-            title="Cuentas nacionales, oferta",
-            subtitle="Contribución al crecimiento interanual",
-            kind="bar",
-            start=start,
-            end=end,
-            extra_trace="Producto bruto interno",
-            height=470,
-        )
-        return supply_plot
-
-    @app.callback(
-        Output("chart-gdp", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_gdp(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("gdp_index_constant_sa_extended")
-        p.chg_diff(period="last")
-        gdp = p.dataset
-        gdp.columns = gdp.columns.get_level_values(0)
-        gdp_plot = build_chart(
-            gdp,
-            title="PBI real",
-            subtitle="Desestacionalizado, variación trimestral",
-            kind="bar",
-            start=start,
-            end=end,
-        )
-        return gdp_plot
-
-    @app.callback(
-        Output("chart-industrial", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_industrial(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("core_industrial_production")
-        p.chg_diff(period="inter")
-        industrial = p.dataset
-        industrial.columns = industrial.columns.get_level_values(0)
-        industrial_plot = build_chart(
-            industrial,
-            title="Producción industrial",
-            subtitle="Variación interanual",
-            kind="line",
-            start=start,
-            end=end,
-        )
-        return industrial_plot
-
-    @app.callback(
-        Output("chart-inflation", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_cpi(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("cpi")
-        p.chg_diff(period="inter")
-        cpi = p.dataset
-        cpi.columns = cpi.columns.get_level_values(0)
-        cpi_plot = build_chart(
-            cpi,
-            title="IPC",
-            subtitle="Variación interanual",
-            kind="line",
-            start=start,
-            end=end,
-        )
-        return cpi_plot
-
-    @app.callback(
-        Output("chart-inflation-measures", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_cpi_measures(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("cpi_divisions")
-        p.chg_diff(period="inter")
-        cpi_measures = p.dataset
-        cpi_measures.columns = cpi_measures.columns.get_level_values(0)
-        cpi_measures_plot = build_chart(
-            cpi_measures,
-            title="IPC por división",
-            subtitle="Variación interanual",
-            kind="line",
-            y=cpi_measures.columns[:-2],
-            start=start,
-            end=end,
-            height=460,
-        )
-        return cpi_measures_plot
-
-    @app.callback(
-        Output("chart-nxr", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_nxr(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("nxr_daily")
-        nxr_daily = p.dataset
-        nxr_daily.columns = nxr_daily.columns.get_level_values(0)
-        nxr_plot = build_chart(
-            nxr_daily,
-            title="Tipo de cambio",
-            subtitle="Cable",
-            kind="area",
-            start=start,
-            end=end,
-        )
-        return nxr_plot
-
-    @app.callback(
-        [
-            Output("chart-primary-global", "figure"),
-            Output("chart-balance-sectors", "figure"),
-        ],
+        [Output(chart_id, "figure") for chart_id in CHARTS],
         [Input("dates", "start_date"), Input("dates", "end_date")],
+        [State("viewport-width", "data")],
     )
-    def build_fiscal_balance(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("fiscal_balance_summary")
-        p.convert(flavor="gdp")
-        balance = p.dataset
-        balance.columns = balance.columns.get_level_values(0)
-        balance_plot = build_chart(
-            balance,
-            title="Resultado fiscal del sector público consolidado",
-            subtitle="% del PBI",
-            kind="line",
-            start=start,
-            end=end,
-            y=[
-                "Resultado: Primario SPC ex FSS",
-                "Resultado: Primario SPC",
-                "Resultado: Global SPC ex FSS",
-                "Resultado: Global SPC",
-            ],
-        )
-        balance_sectors_plot = build_chart(
-            balance,
-            title="Resultado global por sector",
-            subtitle="% del PBI",
-            kind="bar",
-            start=start,
-            end=end,
-            y=[
-                "Resultado: Global GC-BPS ex FSS",
-                "Resultado: Global EEPP",
-                "Resultado: Global intendencias",
-                "Resultado: Global BSE",
-                "Resultado: Global BCU",
-            ],
-        )
-        return balance_plot, balance_sectors_plot
-
-    @app.callback(
-        Output("chart-revenue", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_taxes(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("tax_revenue")
-        p.convert(flavor="real")
-        p.chg_diff(period="inter")
-        tax = p.dataset
-        tax[
-            [
-                "IRAE - Rentas de Actividades Económicas",
-                "IRPF Cat II - Rentas de las Personas Físicas",
-            ]
-        ] = tax[
-            [
-                "IRAE - Rentas de Actividades Económicas",
-                "IRPF Cat II - Rentas de las Personas Físicas",
-            ]
-        ].mask(
-            tax.index.to_series() < "2009-01-01"
-        )
-        tax.columns = tax.columns.get_level_values(0)
-        tax_plot = build_chart(
-            tax,
-            title="Recaudación impositiva",
-            subtitle="Variación interanual",
-            kind="line",
-            start=start,
-            end=end,
-            y=[
-                "IRAE - Rentas de Actividades Económicas",
-                "IRPF Cat II - Rentas de las Personas Físicas",
-                "IVA - Valor Agregado",
-                "Recaudación Total de la DGI",
-            ],
-        )
-        return tax_plot
-
-    @app.callback(
-        Output("chart-debt", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_debt(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("net_public_debt_global_public_sector")
-        p.convert(flavor="gdp")
-        debt = p.dataset
-        debt.columns = debt.columns.get_level_values(0)
-        debt_plot = build_chart(
-            debt,
-            title="Deuda neta del sector público global",
-            subtitle="% del PBI",
-            kind="area",
-            start=start,
-            end=end,
-        )
-        return debt_plot
-
-    @app.callback(
-        [
-            Output("chart-activity-employment", "figure"),
-            Output("chart-unemployment", "figure"),
-        ],
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_labor_rates(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("labor_rates_persons")
-        nsa = p.dataset
-        nsa.columns = nsa.columns.get_level_values(0)
-        trends = sqlutil.read(con=db.engine, table_name="labor_rates_persons_seas")
-        trends.columns = trends.columns.get_level_values(0) + [" (tendencia-ciclo)"]
-        data = pd.concat([nsa, trends], axis=1)
-        activity_employment_plot = build_chart(
-            data,
-            title="Actividad y empleo",
-            subtitle="Tasa",
-            kind="line",
-            start=start,
-            end=end,
-            y=[
-                "Tasa de actividad",
-                "Tasa de actividad (tendencia-ciclo)",
-                "Tasa de empleo",
-                "Tasa de empleo (tendencia-ciclo)",
-            ],
-            height=460,
-        )
-        unemployment_plot = build_chart(
-            data,
-            title="Desempleo",
-            subtitle="Tasa",
-            kind="line",
-            start=start,
-            end=end,
-            y=["Tasa de desempleo", "Tasa de desempleo (tendencia-ciclo)"],
-        )
-
-        return activity_employment_plot, unemployment_plot
-
-    @app.callback(
-        Output("chart-real-wages", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_wages(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("real_wages")
-        p.chg_diff(period="inter")
-        wages = p.dataset
-        wages.columns = wages.columns.get_level_values(0)
-        wages_plot = build_chart(
-            wages,
-            title="Salario real",
-            subtitle="Variación interanual",
-            kind="line",
-            start=start,
-            end=end,
-        )
-        return wages_plot
-
-    @app.callback(
-        Output("chart-exp-imp", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_expimp(start, end):
-        s = Session(location=db.engine, download=False)
-        s.get(["trade_exports_sector_value", "trade_imports_category_value"])
-        s.convert(flavor="gdp")
-        s.concat(concat_name="expimp")
-        data = s.datasets["concat_expimp"]
-        data.columns = data.columns.get_level_values(0)
-        expimp_plot = build_chart(
-            data,
-            title="Exportaciones e importaciones",
-            subtitle="% del PBI",
-            kind="line",
-            start=start,
-            end=end,
-            y=["Total exportaciones", "Total importaciones: CIF "],
-        )
-        return expimp_plot
-
-    @app.callback(
-        Output("chart-tot", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_tot(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("terms_of_trade")
-        p.chg_diff(period="inter")
-        tot = p.dataset
-        tot.columns = tot.columns.get_level_values(0)
-        tot_plot = build_chart(
-            tot,
-            title="Términos de intercambio",
-            subtitle="Variación interanual",
-            kind="area",
-            start=start,
-            end=end,
-        )
-        return tot_plot
-
-    @app.callback(
-        Output("chart-rxr", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_rxr(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("rxr_custom")
-        p.rebase(start_date=p.dataset.index.min(), end_date=p.dataset.index.max())
-        rxr = p.dataset
-        rxr.columns = rxr.columns.get_level_values(0)
-        rxr_plot = build_chart(
-            rxr,
-            title="Tipo de cambio real",
-            subtitle=f"1980-{dt.date.today().year}=100",
-            kind="line",
-            start=start,
-            end=end,
-        )
-        return rxr_plot
-
-    @app.callback(
-        Output("chart-commodity-index", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_commodity(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("commodity_index")
-        p.chg_diff(period="inter")
-        commodity = p.dataset
-        commodity.columns = commodity.columns.get_level_values(0)
-        commodity_plot = build_chart(
-            commodity,
-            title="Índice de precios de commodities",
-            subtitle="Variación interanual",
-            kind="area",
-            start=start,
-            end=end,
-        )
-        return commodity_plot
-
-    @app.callback(
-        Output("chart-ubi", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_ubi(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("sovereign_risk_index")
-        ubi = p.dataset
-        ubi.columns = ubi.columns.get_level_values(0)
-        ubi_plot = build_chart(
-            ubi,
-            title="Uruguay Bond Index",
-            subtitle="Spread con respecto Treasury 10Y",
-            kind="area",
-            start=start,
-            end=end,
-        )
-        return ubi_plot
-
-    @app.callback(
-        Output("chart-bonds", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_bonds(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("sovereign_bond_yields")
-        bonds = p.dataset
-        bonds.columns = bonds.columns.get_level_values(0)
-        bonds_plot = build_chart(
-            bonds,
-            title="Rendimiento de bonos soberanos",
-            subtitle="Puntos básicos",
-            kind="line",
-            start=start,
-            end=end,
-        )
-        return bonds_plot
-
-    @app.callback(
-        Output("chart-regional-gdp", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_regional_gdp(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("regional_monthly_gdp")
-        p.chg_diff(period="inter")
-        gdp = p.dataset
-        gdp.columns = gdp.columns.get_level_values(0)
-        gdp_plot = build_chart(
-            gdp,
-            title="PBI mensual",
-            subtitle="Variación interanual",
-            kind="line",
-            start=start,
-            end=end,
-        )
-        return gdp_plot
-
-    @app.callback(
-        Output("chart-regional-nxr", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_regional_nxr(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("regional_nxr")
-        nxr = p.dataset.pct_change(30) * 100
-        nxr.columns = nxr.columns.get_level_values(0)
-        rxr_plot = build_chart(
-            nxr,
-            title="Tipo de cambio nominal",
-            subtitle="Variación 30 días",
-            kind="line",
-            start=start,
-            end=end,
-        )
-        return rxr_plot
-
-    @app.callback(
-        Output("chart-global-gdp", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_global_gdp(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("global_gdp")
-        p.chg_diff(period="inter")
-        gdp = p.dataset[["Estados Unidos", "Unión Europea", "China"]]
-        gdp.columns = gdp.columns.get_level_values(0)
-        gdp_plot = build_chart(
-            gdp,
-            title="PBI real",
-            subtitle="Variación interanual",
-            kind="line",
-            start=start,
-            end=end,
-        )
-        return gdp_plot
+    def build_charts(start, end, viewport_width):
+        """
+        Build every monitor chart from one batched load of the materialized series.
 
-    @app.callback(
-        Output("chart-global-nxr", "figure"),
-        [Input("dates", "start_date"), Input("dates", "end_date")],
-    )
-    def build_global_nxr(start, end):
-        p = Pipeline(location=db.engine, download=False)
-        p.get("global_nxr")
-        nxr = p.dataset[["Índice Dólar", "Euro", "Renminbi"]].pct_change(30) * 100
-        nxr.columns = nxr.columns.get_level_values(0)
-        nxr_plot = build_chart(
-            nxr,
-            title="Tipo de cambio nominal",
-            subtitle="Variación 30 días",
-            kind="line",
-            start=start,
-            end=end,
-        )
-        return nxr_plot
+        A chart that fails to build is logged and left empty, so it doesn't take
+        the others down with it.
+        """
+        data = get_many(read_db.engine, {spec["series"] for spec in CHARTS.values()})
+        year = dt.date.today().year
+        # Charts sit two per row from the md breakpoint up.
+        width = viewport_width / 2 if viewport_width and viewport_width >= 768 else viewport_width
+
+        def build(chart_id):
+            spec = CHARTS[chart_id]
+            try:
+                series = data[spec["series"]]
+                kwargs = {k: v for k, v in spec.items() if k not in ["series", "subtitle", "y"]}
+                y = spec.get("y")
+                return build_chart(
+                    series,
+                    y=y(series) if callable(y) else y,
+                    subtitle=spec["subtitle"].format(year=year),
+                    start=start,
+                    end=end,
+                    width=width,
+                    **kwargs,
+                )
+            except Exception:
+                logger.exception("Could not build monitor chart %s", chart_id)
+                return go.Figure()
+
+        return list(chart_pool.map(build, CHARTS))
 
 
 def build_chart(
@@ -596,65 +113,32 @@ def build_chart(
     start: str = None,
     end: str = None,
     extra_trace: str = None,
+    width: float = None,
     **kwargs,
 ):
     start = start or "1900-01-01"
     end = end or dt.date.today().strftime("%Y-%m-%d")
-    data = data.loc[start:end]
-    # if len(data) > 7000:
+    data, render_mode = figures.prepare(data.loc[start:end], width)
     full_title = f"{title}<br><span style='font-size:14px'>{subtitle}</span>"
-    if y is None:
-        y = data.columns
-    if kind == "line":
-        fig = px.line(
-            data,
-            y=y,
-            color_discrete_sequence=px.colors.qualitative.Bold,
-            title=full_title,
-            **kwargs,
-        )
-    elif kind == "bar":
-        fig = px.bar(
-            data,
-            y=y,
-            color_discrete_sequence=px.colors.qualitative.Bold,
-            title=full_title,
-            **kwargs,
-        )
-    else:
-        fig = px.area(
-            data,
-            y=y,
-            color_discrete_sequence=px.colors.qualitative.Bold,
-            title=full_title,
-            **kwargs,
-        )
+    fig = figures.build_figure(
+        data,
+        kind=kind,
+        y=y,
+        title=full_title,
+        yaxis_title=yaxis_label or "",
+        render_mode=render_mode,
+        yaxis_tickformat=y_tickformat or "",
+        **kwargs,
+    )
     if extra_trace is not None:
+        scatter = go.Scattergl if render_mode == "webgl" else go.Scatter
         fig.add_trace(
-            go.Scatter(
+            scatter(
                 x=data.index,
-                y=data[extra_trace],
+                y=figures.round_values(data[extra_trace].to_numpy()),
                 mode="lines",
                 line=go.scatter.Line(color="black"),
                 name=extra_trace,
             )
         )
-    fig.update_layout(
-        {
-            "margin": {"l": 20, "r": 20},
-            "legend": {
-                "orientation": "h",
-                "yanchor": "top",
-                "y": -0.1,
-                "xanchor": "left",
-                "x": 0,
-            },
-            "legend_orientation": "h",
-            "xaxis_title": "",
-            "yaxis_title": yaxis_label or "",
-            "legend_title": "",
-            "title": {"y": 0.9, "yanchor": "top", "font": {"size": 16}},
-            "yaxis_tickformat": y_tickformat or "",
-        }
-    )
     return fig
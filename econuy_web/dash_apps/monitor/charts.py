@@ -0,0 +1,191 @@
+# Maps each dcc.Graph id in components.py to the materialized series it plots
+# (see series.SERIES, which holds the dataset and its transformation) and the
+# arguments passed to build_chart. "y" is either a list of columns or a callable
+# that selects them from the series. Subtitles are formatted with the current year.
+CHARTS = {
+    "chart-gdp": {
+        "series": "gdp",
+        "title": "PBI real",
+        "subtitle": "Desestacionalizado, variación trimestral",
+        "kind": "bar",
+    },
+    "chart-industrial": {
+        "series": "industrial",
+        "title": "Producción industrial",
+        "subtitle": "Variación interanual",
+        "kind": "line",
+    },
+    "chart-demand": {
+        "series": "demand",
+        "title": "Cuentas nacionales, demanda",
+        "subtitle": "Contribución al crecimiento interanual",
+        "kind": "bar",
+        "y": [
+            "Gasto de consumo: hogares",
+            "Gasto de consumo: gobierno y ISFLH",
+            "Formación bruta de capital",
+            "Exportaciones de bienes y servicios",
+            "Importaciones de bienes y servicios",
+        ],
+        "extra_trace": "Producto bruto interno",
+    },
+    "chart-supply": {
+        "series": "supply",
+        "title": "Cuentas nacionales, oferta",
+        "subtitle": "Contribución al crecimiento interanual",
+        "kind": "bar",
+        "y": lambda data: data.columns[:-1],
+        "extra_trace": "Producto bruto interno",
+        "height": 470,
+    },
+    "chart-inflation": {
+        "series": "cpi",
+        "title": "IPC",
+        "subtitle": "Variación interanual",
+        "kind": "line",
+    },
+    "chart-inflation-measures": {
+        "series": "cpi_divisions",
+        "title": "IPC por división",
+        "subtitle": "Variación interanual",
+        "kind": "line",
+        "y": lambda data: data.columns[:-2],
+        "height": 460,
+    },
+    "chart-nxr": {
+        "series": "nxr",
+        "title": "Tipo de cambio",
+        "subtitle": "Cable",
+        "kind": "area",
+    },
+    "chart-primary-global": {
+        "series": "fiscal_balance",
+        "title": "Resultado fiscal del sector público consolidado",
+        "subtitle": "% del PBI",
+        "kind": "line",
+        "y": [
+            "Resultado: Primario SPC ex FSS",
+            "Resultado: Primario SPC",
+            "Resultado: Global SPC ex FSS",
+            "Resultado: Global SPC",
+        ],
+    },
+    "chart-balance-sectors": {
+        "series": "fiscal_balance",
+        "title": "Resultado global por sector",
+        "subtitle": "% del PBI",
+        "kind": "bar",
+        "y": [
+            "Resultado: Global GC-BPS ex FSS",
+            "Resultado: Global EEPP",
+            "Resultado: Global intendencias",
+            "Resultado: Global BSE",
+            "Resultado: Global BCU",
+        ],
+    },
+    "chart-revenue": {
+        "series": "taxes",
+        "title": "Recaudación impositiva",
+        "subtitle": "Variación interanual",
+        "kind": "line",
+        "y": [
+            "IRAE - Rentas de Actividades Económicas",
+            "IRPF Cat II - Rentas de las Personas Físicas",
+            "IVA - Valor Agregado",
+            "Recaudación Total de la DGI",
+        ],
+    },
+    "chart-debt": {
+        "series": "debt",
+        "title": "Deuda neta del sector público global",
+        "subtitle": "% del PBI",
+        "kind": "area",
+    },
+    "chart-activity-employment": {
+        "series": "labor_rates",
+        "title": "Actividad y empleo",
+        "subtitle": "Tasa",
+        "kind": "line",
+        "y": [
+            "Tasa de actividad",
+            "Tasa de actividad (tendencia-ciclo)",
+            "Tasa de empleo",
+            "Tasa de empleo (tendencia-ciclo)",
+        ],
+        "height": 460,
+    },
+    "chart-unemployment": {
+        "series": "labor_rates",
+        "title": "Desempleo",
+        "subtitle": "Tasa",
+        "kind": "line",
+        "y": ["Tasa de desempleo", "Tasa de desempleo (tendencia-ciclo)"],
+    },
+    "chart-real-wages": {
+        "series": "wages",
+        "title": "Salario real",
+        "subtitle": "Variación interanual",
+        "kind": "line",
+    },
+    "chart-exp-imp": {
+        "series": "expimp",
+        "title": "Exportaciones e importaciones",
+        "subtitle": "% del PBI",
+        "kind": "line",
+        "y": ["Total exportaciones", "Total importaciones: CIF "],
+    },
+    "chart-tot": {
+        "series": "tot",
+        "title": "Términos de intercambio",
+        "subtitle": "Variación interanual",
+        "kind": "area",
+    },
+    "chart-rxr": {
+        "series": "rxr",
+        "title": "Tipo de cambio real",
+        "subtitle": "1980-{year}=100",
+        "kind": "line",
+    },
+    "chart-commodity-index": {
+        "series": "commodity",
+        "title": "Índice de precios de commodities",
+        "subtitle": "Variación interanual",
+        "kind": "area",
+    },
+    "chart-ubi": {
+        "series": "ubi",
+        "title": "Uruguay Bond Index",
+        "subtitle": "Spread con respecto Treasury 10Y",
+        "kind": "area",
+    },
+    "chart-bonds": {
+        "series": "bonds",
+        "title": "Rendimiento de bonos soberanos",
+        "subtitle": "Puntos básicos",
+        "kind": "line",
+    },
+    "chart-regional-gdp": {
+        "series": "regional_gdp",
+        "title": "PBI mensual",
+        "subtitle": "Variación interanual",
+        "kind": "line",
+    },
+    "chart-regional-nxr": {
+        "series": "regional_nxr",
+        "title": "Tipo de cambio nominal",
+        "subtitle": "Variación 30 días",
+        "kind": "line",
+    },
+    "chart-global-gdp": {
+        "series": "global_gdp",
+        "title": "PBI real",
+        "subtitle": "Variación interanual",
+        "kind": "line",
+    },
+    "chart-global-nxr": {
+        "series": "global_nxr",
+        "title": "Tipo de cambio nominal",
+        "subtitle": "Variación 30 días",
+        "kind": "line",
+    },
+}
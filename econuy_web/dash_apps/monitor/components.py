@@ -8,6 +8,17 @@ from econuy_web.dash_apps.querystrings import apply_qs
 from econuy_web.dash_apps.general_components import NAVBAR, FOOTER
 
 
+_default_layout = None
+
+
+def default_layout():
+    """Layout for the page without a querystring, built once and shared by every request."""
+    global _default_layout
+    if _default_layout is None:
+        _default_layout = build_layout({})
+    return _default_layout
+
+
 def build_layout(params):
     return html.Div(
         [
@@ -26,6 +26,7 @@ def add_dash(server):
     app.layout = html.Div(
         [
             dcc.Location(id="url", refresh=False),
+            dcc.Store(id="viewport-width"),
             html.Div(id="page-layout"),
         ]
     )
@@ -0,0 +1,223 @@
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Union
+
+import pandas as pd
+from sqlalchemy import inspect
+from sqlalchemy.engine.base import Connection, Engine
+
+from econuy_web.cache import CachedPipeline, CachedSession, data_cache
+
+
+MONITOR_TABLE = "econuy_web_monitor"
+
+logger = logging.getLogger(__name__)
+
+_series = None
+_series_version = None
+_series_lock = threading.Lock()
+
+
+def _flat(p: CachedPipeline) -> pd.DataFrame:
+    data = p.dataset
+    data.columns = data.columns.get_level_values(0)
+    return data
+
+
+def _pipeline(con: Engine, name: str) -> CachedPipeline:
+    p = CachedPipeline(location=con, download=False)
+    p.get(name)
+    return p
+
+
+def _contributions(data: pd.DataFrame) -> pd.DataFrame:
+    """Contribution of each component to year-on-year GDP growth."""
+    return (
+        data.div(data["Producto bruto interno"], axis=0).shift(4).mul(data.pct_change(4), axis=0)
+        * 100
+    )
+
+
+def _inter(con: Engine, name: str) -> pd.DataFrame:
+    p = _pipeline(con, name)
+    p.chg_diff(period="inter")
+    return _flat(p)
+
+
+def _raw(con: Engine, name: str) -> pd.DataFrame:
+    return _flat(_pipeline(con, name))
+
+
+def demand(con: Engine) -> pd.DataFrame:
+    data = _contributions(_raw(con, "national_accounts_demand_constant_nsa_extended"))
+    data["Importaciones de bienes y servicios"] = data["Importaciones de bienes y servicios"] * -1
+    return data
+
+
+def supply(con: Engine) -> pd.DataFrame:
+    return _contributions(_raw(con, "national_accounts_supply_constant_nsa_extended"))
+
+
+def gdp(con: Engine) -> pd.DataFrame:
+    p = _pipeline(con, "gdp_index_constant_sa_extended")
+    p.chg_diff(period="last")
+    return _flat(p)
+
+
+def fiscal_balance(con: Engine) -> pd.DataFrame:
+    p = _pipeline(con, "fiscal_balance_summary")
+    p.convert(flavor="gdp")
+    return _flat(p)
+
+
+def taxes(con: Engine) -> pd.DataFrame:
+    p = _pipeline(con, "tax_revenue")
+    p.convert(flavor="real")
+    p.chg_diff(period="inter")
+    tax = p.dataset
+    income_taxes = [
+        "IRAE - Rentas de Actividades Económicas",
+        "IRPF Cat II - Rentas de las Personas Físicas",
+    ]
+    tax[income_taxes] = tax[income_taxes].mask(tax.index.to_series() < "2009-01-01")
+    tax.columns = tax.columns.get_level_values(0)
+    return tax
+
+
+def debt(con: Engine) -> pd.DataFrame:
+    p = _pipeline(con, "net_public_debt_global_public_sector")
+    p.convert(flavor="gdp")
+    return _flat(p)
+
+
+def labor_rates(con: Engine) -> pd.DataFrame:
+    nsa = _raw(con, "labor_rates_persons")
+    trends = data_cache.read(con=con, table_name="labor_rates_persons_seas")
+    trends.columns = trends.columns.get_level_values(0) + [" (tendencia-ciclo)"]
+    return pd.concat([nsa, trends], axis=1)
+
+
+def expimp(con: Engine) -> pd.DataFrame:
+    s = CachedSession(location=con, download=False)
+    s.get(["trade_exports_sector_value", "trade_imports_category_value"])
+    s.convert(flavor="gdp")
+    s.concat(concat_name="expimp")
+    data = s.datasets["concat_expimp"]
+    data.columns = data.columns.get_level_values(0)
+    return data
+
+
+def rxr(con: Engine) -> pd.DataFrame:
+    p = _pipeline(con, "rxr_custom")
+    p.rebase(start_date=p.dataset.index.min(), end_date=p.dataset.index.max())
+    return _flat(p)
+
+
+def regional_nxr(con: Engine) -> pd.DataFrame:
+    return _raw(con, "regional_nxr").pct_change(30) * 100
+
+
+def global_gdp(con: Engine) -> pd.DataFrame:
+    p = _pipeline(con, "global_gdp")
+    p.chg_diff(period="inter")
+    return _flat(p)[["Estados Unidos", "Unión Europea", "China"]]
+
+
+def global_nxr(con: Engine) -> pd.DataFrame:
+    return _raw(con, "global_nxr")[["Índice Dólar", "Euro", "Renminbi"]].pct_change(30) * 100
+
+
+SERIES: Dict[str, Callable[[Engine], pd.DataFrame]] = {
+    "demand": demand,
+    "supply": supply,
+    "gdp": gdp,
+    "industrial": lambda con: _inter(con, "core_industrial_production"),
+    "cpi": lambda con: _inter(con, "cpi"),
+    "cpi_divisions": lambda con: _inter(con, "cpi_divisions"),
+    "nxr": lambda con: _raw(con, "nxr_daily"),
+    "fiscal_balance": fiscal_balance,
+    "taxes": taxes,
+    "debt": debt,
+    "labor_rates": labor_rates,
+    "wages": lambda con: _inter(con, "real_wages"),
+    "expimp": expimp,
+    "tot": lambda con: _inter(con, "terms_of_trade"),
+    "rxr": rxr,
+    "commodity": lambda con: _inter(con, "commodity_index"),
+    "ubi": lambda con: _raw(con, "sovereign_risk_index"),
+    "bonds": lambda con: _raw(con, "sovereign_bond_yields"),
+    "regional_gdp": lambda con: _inter(con, "regional_monthly_gdp"),
+    "regional_nxr": regional_nxr,
+    "global_gdp": global_gdp,
+    "global_nxr": global_nxr,
+}
+
+
+def to_long(name: str, data: pd.DataFrame) -> pd.DataFrame:
+    positions = {column: position for position, column in enumerate(data.columns)}
+    long = data.rename_axis("date").reset_index().melt(id_vars="date", var_name="indicator")
+    # Missing values are dropped, but one row is kept for columns that are all missing so
+    # from_long still returns them.
+    present = long["value"].notna()
+    empty = ~long["indicator"].isin(long.loc[present, "indicator"])
+    long = long[present | (empty & ~long["indicator"].duplicated())]
+    long.insert(0, "series", name)
+    long.insert(2, "position", long["indicator"].map(positions))
+    return long
+
+
+def from_long(long: pd.DataFrame) -> pd.DataFrame:
+    columns = long.drop_duplicates("indicator").sort_values("position")["indicator"]
+    data = long.pivot(index="date", columns="indicator", values="value")
+    data = data.reindex(columns=columns).dropna(how="all")
+    data.index = pd.to_datetime(data.index)
+    data.columns.name = None
+    data.index.name = None
+    return data
+
+
+def materialize(con: Engine):
+    """
+    Compute every monitor series and store them in a single long-format table.
+
+    Runs after each data refresh, so monitor callbacks only slice precomputed
+    data instead of reading and transforming datasets on every date change.
+    """
+    long = pd.concat([to_long(name, function(con)) for name, function in SERIES.items()])
+    long.to_sql(name=MONITOR_TABLE, con=con, if_exists="replace", index=False)
+
+    return
+
+
+def read_series(con: Union[Connection, Engine]) -> Dict[str, pd.DataFrame]:
+    if not inspect(con).has_table(MONITOR_TABLE):
+        return {}
+    long = pd.read_sql(sql=MONITOR_TABLE, con=con, parse_dates=["date"])
+    return {name: from_long(group) for name, group in long.groupby("series", sort=False)}
+
+
+def get_many(con: Engine, names: Iterable[str]) -> Dict[str, pd.DataFrame]:
+    """
+    Per-worker copies of materialized monitor series.
+
+    All series are loaded together in a single query and reloaded only after
+    ``update.py`` bumps their version. Series missing from the table are
+    computed on the fly, and left out if that fails.
+    """
+    global _series, _series_version
+    version = data_cache.version(con, MONITOR_TABLE)
+    with _series_lock:
+        if _series is None or version != _series_version:
+            _series = read_series(con)
+            _series_version = version
+        for name in names:
+            if name not in _series:
+                try:
+                    _series[name] = SERIES[name](con)
+                except Exception:
+                    logger.exception("Could not compute monitor series %s", name)
+        return {name: _series[name].copy() for name in names if name in _series}
+
+
+def get_series(con: Engine, name: str) -> pd.DataFrame:
+    return get_many(con, [name])[name]
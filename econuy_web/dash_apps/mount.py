@@ -0,0 +1,101 @@
+import importlib
+import threading
+
+from flask import Flask, request
+
+
+# URL prefix of each Dash app and the module with its ``add_dash(server)``.
+DASH_APPS = {
+    "/interactive/": "econuy_web.dash_apps.visualization.visualization",
+    "/monitor/": "econuy_web.dash_apps.monitor.monitor",
+}
+
+
+def mount_all(app: Flask) -> Flask:
+    for module in DASH_APPS.values():
+        app = importlib.import_module(module).add_dash(app)
+    return app
+
+
+# App-level hooks, keyed by blueprint name, that a lazily mounted Dash server shares with the app.
+SHARED_HOOKS = [
+    "before_request_funcs",
+    "after_request_funcs",
+    "teardown_request_funcs",
+    "template_context_processors",
+    "url_value_preprocessors",
+    "url_default_functions",
+]
+
+
+def share_setup(app: Flask, server: Flask):
+    """
+    Set up ``server`` like ``app``, short of its routes.
+
+    The config, the app-level error handlers and request hooks, the
+    blueprints and the extensions registered on ``app`` are shared. URLs for
+    the app's own endpoints, like those in the error page templates, are
+    built with the app's URL map.
+    """
+    server.config.from_mapping(app.config)
+    for blueprint in app.blueprints.values():
+        server.register_blueprint(blueprint)
+    for hooks in SHARED_HOOKS:
+        getattr(server, hooks)[None] = list(getattr(app, hooks).get(None, []))
+    server.error_handler_spec[None] = app.error_handler_spec[None]
+    server.teardown_appcontext_funcs.extend(app.teardown_appcontext_funcs)
+    server.extensions.update(app.extensions)
+    server.jinja_env.globals.update(app.jinja_env.globals)
+
+    def build_on_app(error, endpoint, values):
+        # url_for passes its own options along with the endpoint's values, prefixed with "_".
+        adapter = app.url_map.bind_to_environ(request.environ)
+        return adapter.build(
+            endpoint,
+            {key: value for key, value in values.items() if not key.startswith("_")},
+            method=values.get("_method"),
+            force_external=bool(values.get("_external")),
+        )
+
+    server.url_build_error_handlers.append(build_on_app)
+
+    return
+
+
+class LazyDash(object):
+    """
+    WSGI middleware that mounts each Dash app on the first request to its prefix.
+
+    Importing the Dash apps pulls in dash, plotly, econuy's transformations
+    and their layouts, so workers that never serve them skip that cost. Flask
+    doesn't allow adding routes once an app has handled a request, so each
+    Dash app gets its own Flask server, set up like the main app by
+    ``share_setup``, and requests are dispatched by path.
+    """
+
+    def __init__(self, app: Flask):
+        self.app = app
+        self.wsgi_app = app.wsgi_app
+        self.servers = {}
+        self._lock = threading.Lock()
+
+    def mount(self, prefix: str) -> Flask:
+        with self._lock:
+            if prefix not in self.servers:
+                server = Flask(self.app.import_name)
+                share_setup(self.app, server)
+                with self.app.app_context():
+                    module = importlib.import_module(DASH_APPS[prefix])
+                    self.servers[prefix] = module.add_dash(server)
+            return self.servers[prefix]
+
+    def mount_all(self):
+        for prefix in DASH_APPS:
+            self.mount(prefix)
+
+    def __call__(self, environ, start_response):
+        path = environ.get("PATH_INFO", "")
+        for prefix in DASH_APPS:
+            if path.startswith(prefix) or path == prefix.rstrip("/"):
+                return self.mount(prefix)(environ, start_response)
+        return self.wsgi_app(environ, start_response)
@@ -1,37 +1,25 @@
-from os import path
-from io import StringIO
-
-import pandas as pd
-import plotly.express as px
 from dash import html
 from dash import dcc
 import dash_bootstrap_components as dbc
 from dash import dash_table as dt
-from PIL import Image
+from dash import no_update
 from dash.dependencies import Input, Output, State
 from dash.exceptions import PreventUpdate
 from dash.dash_table.Format import Format, Scheme, Group
-from econuy.utils import sql as sqlutil
-from econuy import Pipeline
-from econuy.transform import (
-    chg_diff,
-    convert_usd,
-    convert_real,
-    convert_gdp,
-    resample,
-    rolling,
-    rebase,
-    decompose,
-)
-from flask import current_app
+from econuy.transform import resample
 
+from econuy_web import catalog, jobs
+from econuy_web.cache import data_cache
+from econuy_web.frame_store import frame_store
+from econuy_web.jobs import job_queue
+from econuy_web.dash_apps import figures
 from econuy_web.dash_apps.querystrings import encode_state, parse_state
-from econuy_web.dash_apps.visualization.components import build_layout
-from econuy_web.dash_apps.visualization import utils
+from econuy_web.dash_apps.visualization.components import build_layout, default_layout
+from econuy_web.dash_apps.visualization import exports, transformations, transport, utils
 
 
 def register_general_callbacks(app):
-    from econuy_web import db
+    figures.register_viewport_callback(app)
 
     @app.callback(
         Output("navbar-collapse", "is_open"),
@@ -102,6 +90,8 @@ def register_general_callbacks(app):
         if not href:
             return []
         state = parse_state(href)
+        if not state:
+            return default_layout()
         return build_layout(state)
 
     @app.callback(
@@ -138,19 +128,23 @@ def register_general_callbacks(app):
             Output("final-metadata", "data"),
             Output("csv-button", "disabled"),
             Output("xlsx-button", "disabled"),
+            Output("parquet-button", "disabled"),
+            Output("feather-button", "disabled"),
             Output("metadata-button", "disabled"),
             Output("metadata-collapse", "children"),
         ],
         [Input(f"data-transformed-{i}", "data") for i in range(1, 4)]
         + [Input(f"metadata-transformed-{i}", "data") for i in range(1, 4)],
         [State(f"table-{i}", "value") for i in range(1, 4)]
-        + [State(f"indicator-{i}", "value") for i in range(1, 4)],
+        + [State(f"indicator-{i}", "value") for i in range(1, 4)]
+        + [State("chart-dates", "start_date"), State("chart-dates", "end_date")],
     )
     def build_final_df_and_metadata(*args):
         data_records = args[:3]
         metadata_records = args[3:6]
         tables = args[6:9]
-        indicators = args[9:]
+        indicators = args[9:12]
+        start_date, end_date = args[12:]
         dfs = []
         for data_record, metadata_record, table, indicator in zip(
             data_records, metadata_records, tables, indicators
@@ -158,24 +152,19 @@ def register_general_callbacks(app):
             if not table or not indicator:
                 continue
             if data_record:
-                transformed = pd.DataFrame.from_records(
-                    data_record, coerce_float=True, index="index"
-                )
-                transformed.index = pd.to_datetime(transformed.index)
-                metadata = pd.DataFrame.from_records(metadata_record)
-                transformed.columns = pd.MultiIndex.from_frame(metadata)
-                dfs.append(transformed)
+                dfs.append(transport.decode(data_record, metadata_record))
         if len(dfs) == 0:
-            return {}, {}, True, True, True, []
+            return {}, {}, True, True, True, True, True, []
         dfs = [df for df in dfs if df is not None]
         tables = [table for table in tables if table is not None]
         tables_dedup = utils.dedup_colnames(dfs=dfs, tables=tables)
         final_data = utils.concat(dfs=tables_dedup)
+        # Reads include the lookback each transformation needs, so trim back to the chart window.
+        final_data = final_data.loc[start_date:end_date]
         final_data.dropna(how="all", inplace=True)
 
         final_metadata = final_data.columns.to_frame()
-        final_data.columns = final_data.columns.get_level_values(0)
-        final_data.reset_index(inplace=True)
+        final_payload, final_metadata_records = transport.encode(final_data)
         collapse_metadata = dbc.Card(
             dbc.CardBody(
                 dbc.Table.from_dataframe(
@@ -192,8 +181,10 @@ def register_general_callbacks(app):
         )
 
         return (
-            final_data.to_dict("records"),
-            final_metadata.to_dict("records"),
+            final_payload,
+            final_metadata_records,
+            False,
+            False,
             False,
             False,
             False,
@@ -203,7 +194,6 @@ def register_general_callbacks(app):
     @app.callback(
         [
             Output("graph-spinner", "children"),
-            Output("html-div", "children"),
             Output("clipboard", "className"),
         ],
         [
@@ -214,6 +204,7 @@ def register_general_callbacks(app):
             Input("chart-dates", "start_date"),
             Input("chart-dates", "end_date"),
             Input("chart-type", "value"),
+            Input("viewport-width", "data"),
         ]
         + [Input(f"table-{i}", "value") for i in range(1, 4)]
         + [Input(f"indicator-{i}", "value") for i in range(1, 4)],
@@ -226,18 +217,24 @@ def register_general_callbacks(app):
         start_date,
         end_date,
         chart_type,
+        width,
         *tables_indicators,
     ):
         if not final_data_record:
-            return dcc.Graph(id="graph"), "", "d-inline btn btn-primary disabled"
-        data = pd.DataFrame.from_records(final_data_record, coerce_float=True, index="index")
-        final_metadata = pd.DataFrame.from_records(final_metadata_record)
-        data.index = pd.to_datetime(data.index)
+            return dcc.Graph(id="graph"), "d-inline btn btn-primary disabled"
+        data = transport.decode(final_data_record, final_metadata_record)
+        final_metadata = data.columns.to_frame(index=False)
+        data.columns = data.columns.get_level_values(0)
         start_date = start_date or "1970-01-01"
         end_date = end_date or "2100-01-01"
         data = data.loc[(data.index >= start_date) & (data.index <= end_date), :]
-        if len(data) > 7000:
-            data = resample(data, rule="M", operation="mean")
+        if chart_type == "table":
+            if len(data) > 7000:
+                data = resample(data, rule="M", operation="mean")
+        elif chart_type == "lineyears":
+            render_mode = "webgl" if data.size > figures.WEBGL_POINTS else "svg"
+        else:
+            data, render_mode = figures.prepare(data, width)
 
         tables = tables_indicators[:3]
         indicators = tables_indicators[3:]
@@ -250,69 +247,6 @@ def register_general_callbacks(app):
             title = f"{title}<br><span style='font-size: 14px'>{subtitle}</span>"
         height = 600 + 20 * len(labels_dedup)
         if chart_type != "table":
-            if chart_type == "bar":
-                fig = px.bar(
-                    data,
-                    y=data.columns,
-                    height=height,
-                    title=title,
-                    color_discrete_sequence=px.colors.qualitative.Bold,
-                    barmode="group",
-                )
-            elif chart_type == "stackbar":
-                fig = px.bar(
-                    data,
-                    y=data.columns,
-                    height=height,
-                    title=title,
-                    color_discrete_sequence=px.colors.qualitative.Bold,
-                    barmode="stack",
-                )
-            elif chart_type == "area":
-                fig = px.area(
-                    data,
-                    y=data.columns,
-                    height=height,
-                    title=title,
-                    color_discrete_sequence=px.colors.qualitative.Bold,
-                )
-            elif chart_type == "normarea":
-                fig = px.area(
-                    data,
-                    y=data.columns,
-                    height=height,
-                    title=title,
-                    color_discrete_sequence=px.colors.qualitative.Bold,
-                    groupnorm="fraction",
-                )
-            elif chart_type == "lineyears":
-                aux = data.copy()
-                aux["Año"] = aux.index.year
-                if pd.infer_freq(aux.index) in ["M", "MS", "Q", "Q-DEC"]:
-                    aux["Período"] = aux.index.month_name()
-                elif pd.infer_freq(aux.index) in ["A", "A-DEC"]:
-                    raise PreventUpdate
-                elif pd.infer_freq(aux.index) in ["W", "W-SUN"]:
-                    aux["Período"] = aux.index.strftime("%U").astype("int32")
-                else:
-                    aux["Período"] = aux.index.dayofyear
-                fig = px.line(
-                    aux,
-                    y=aux.columns,
-                    color="Año",
-                    x="Período",
-                    height=height,
-                    title=title,
-                    color_discrete_sequence=px.colors.qualitative.Bold,
-                )
-            else:
-                fig = px.line(
-                    data,
-                    y=data.columns,
-                    height=height,
-                    title=title,
-                    color_discrete_sequence=px.colors.qualitative.Bold,
-                )
             ylabels = []
             for currency, unit, inf in zip(
                 final_metadata["Moneda"],
@@ -330,36 +264,23 @@ def register_general_callbacks(app):
                 ylabels = ylabels[0]
             else:
                 ylabels = ""
-            fig.update_layout(
-                {
-                    "margin": {"l": 20, "r": 20},
-                    "legend": {
-                        "orientation": "h",
-                        "yanchor": "top",
-                        "y": -0.1,
-                        "xanchor": "left",
-                        "x": 0,
-                    },
-                    "legend_orientation": "h",
-                    "xaxis_title": "",
-                    "yaxis_title": ylabels,
-                    "legend_title": "",
-                    "title": {"y": 0.9, "yanchor": "top", "font": {"size": 16}},
-                }
-            )
-            path_to_logo = path.join(current_app.root_path, "static", "cards.jpg")
-            fig.add_layout_image(
-                dict(
-                    source=Image.open(path_to_logo),
-                    sizex=0.1,
-                    sizey=0.1,
-                    xanchor="right",
-                    yanchor="bottom",
-                    xref="paper",
-                    yref="paper",
-                    x=1,
-                    y=1.01,
-                )
+            kind, barmode, groupnorm = {
+                "bar": ("bar", "group", None),
+                "stackbar": ("bar", "stack", None),
+                "area": ("area", "relative", None),
+                "normarea": ("area", "relative", "fraction"),
+                "lineyears": ("lineyears", "relative", None),
+            }.get(chart_type, ("line", "relative", None))
+            fig = figures.build_figure(
+                data,
+                kind=kind,
+                title=title,
+                yaxis_title=ylabels,
+                render_mode=render_mode,
+                barmode=barmode,
+                groupnorm=groupnorm,
+                template="econuy_logo",
+                height=height,
             )
             # fig.update_xaxes(
             #     rangeselector=dict(yanchor="bottom", y=1.01, xanchor="right",
@@ -376,11 +297,8 @@ def register_general_callbacks(app):
             #                             dict(count=5, label="5a", step="year",
             #                                 stepmode="backward"),
             #                             dict(label="todos", step="all")])))
-            html_string = StringIO()
-            fig.write_html(html_string)
-            html_string.seek(0)
             viz = dcc.Graph(figure=fig, id="graph", config={"displayModeBar": False})
-            return viz, html_string.read(), "d-inline btn btn-primary"
+            return viz, "d-inline btn btn-primary"
         else:
             data.reset_index(inplace=True)
             data.rename(columns={"index": "Fecha"}, inplace=True)
@@ -419,7 +337,18 @@ def register_general_callbacks(app):
                     ),
                 ]
             )
-            return viz, [], "d-inline btn btn-primary disabled"
+            return viz, "d-inline btn btn-primary disabled"
+
+    @app.callback(
+        Output("clipboard", "content"),
+        [Input("clipboard", "n_clicks")],
+        [State("graph", "figure")],
+        prevent_initial_call=True,
+    )
+    def copy_html(n, figure):
+        if not figure:
+            raise PreventUpdate
+        return figures.standalone_html(figure)
 
     @app.callback(
         Output("download-data-csv", "data"),
@@ -428,14 +357,17 @@ def register_general_callbacks(app):
         prevent_initial_call=True,
     )
     def download_csv(n, final_data_record, final_metadata_record):
-        if not final_data_record:
+        # Server-side frames are streamed by the /download route through csv-link instead.
+        if not final_data_record or "key" in final_data_record:
             raise PreventUpdate
-        data = pd.DataFrame.from_records(final_data_record, coerce_float=True, index="index")
-        final_metadata = pd.DataFrame.from_records(final_metadata_record)
-        data.index = pd.to_datetime(data.index)
-        data.columns = pd.MultiIndex.from_frame(final_metadata)
-        data.rename_axis(None, axis=0, inplace=True)
-        return dcc.send_bytes(str.encode(data.to_csv(), encoding="latin1"), "econuy-data.csv")
+        data = transport.decode(final_data_record, final_metadata_record)
+        return dcc.send_bytes(lambda buffer: exports.write_csv(data, buffer), "econuy-data.csv")
+
+    @app.callback(Output("csv-link", "href"), [Input("final-data", "data")])
+    def csv_link(final_data_record):
+        if final_data_record and "key" in final_data_record:
+            return f"/download/{final_data_record['key']}.csv"
+        return None
 
     @app.callback(
         Output("download-data-xlsx", "data"),
@@ -446,16 +378,40 @@ def register_general_callbacks(app):
     def download_xlsx(n, final_data_record, final_metadata_record):
         if not final_data_record:
             raise PreventUpdate
-        data = pd.DataFrame.from_records(final_data_record, coerce_float=True, index="index")
-        final_metadata = pd.DataFrame.from_records(final_metadata_record)
-        data.index = pd.to_datetime(data.index)
-        data.columns = pd.MultiIndex.from_frame(final_metadata)
-        data.rename_axis(None, axis=0, inplace=True)
+        data = transport.decode(final_data_record, final_metadata_record)
         return dcc.send_bytes(data.to_excel, "econuy-data.xlsx")
 
+    @app.callback(
+        Output("download-data-parquet", "data"),
+        [Input("parquet-button", "n_clicks")],
+        [State("final-data", "data"), State("final-metadata", "data")],
+        prevent_initial_call=True,
+    )
+    def download_parquet(n, final_data_record, final_metadata_record):
+        if not final_data_record:
+            raise PreventUpdate
+        data = transport.decode(final_data_record, final_metadata_record)
+        return dcc.send_bytes(
+            lambda buffer: exports.write_parquet(data, buffer), "econuy-data.parquet"
+        )
+
+    @app.callback(
+        Output("download-data-feather", "data"),
+        [Input("feather-button", "n_clicks")],
+        [State("final-data", "data"), State("final-metadata", "data")],
+        prevent_initial_call=True,
+    )
+    def download_feather(n, final_data_record, final_metadata_record):
+        if not final_data_record:
+            raise PreventUpdate
+        data = transport.decode(final_data_record, final_metadata_record)
+        return dcc.send_bytes(
+            lambda buffer: exports.write_feather(data, buffer), "econuy-data.feather"
+        )
+
 
 def register_tabs_callbacks(app, i: int):
-    from econuy_web import db
+    from econuy_web.database import read_db
 
     @app.callback(
         [Output(f"indicator-{i}", "options"), Output(f"indicator-{i}", "disabled")],
@@ -464,8 +420,11 @@ def register_tabs_callbacks(app, i: int):
     def indicator_options(table):
         if not table:
             raise PreventUpdate
-        df = sqlutil.read(con=db.engine, table_name=table)
-        columns = df.columns.get_level_values(0)
+        columns = catalog.indicators(read_db.engine, table)
+        if not columns:
+            columns = data_cache.read(
+                con=read_db.engine, table_name=table
+            ).columns.get_level_values(0)
         return (
             [{"label": "Todos los indicadores", "value": "*"}]
             + [{"label": v, "value": v} for v in columns]
@@ -520,25 +479,90 @@ def register_tabs_callbacks(app, i: int):
         new_values_dedup = list(dict.fromkeys(new_values))
         return transformations_on, False, new_values_dedup
 
+    def needed_window(table, chart_start, chart_end, order, **params):
+        """Dates to read so that ``order`` fills the chart window, see ``utils.query_window``."""
+        return utils.query_window(
+            chart_start,
+            chart_end,
+            order=order,
+            freq=catalog.frequency(read_db.engine, table),
+            **params,
+        )
+
     @app.callback(
-        [Output(f"data-{i}", "data"), Output(f"metadata-{i}", "data")],
-        [Input(f"table-{i}", "value"), Input(f"indicator-{i}", "value")],
+        [
+            Output(f"data-{i}", "data"),
+            Output(f"metadata-{i}", "data"),
+            Output(f"query-window-{i}", "data"),
+        ],
+        [
+            Input(f"table-{i}", "value"),
+            Input(f"indicator-{i}", "value"),
+            Input("chart-dates", "start_date"),
+            Input("chart-dates", "end_date"),
+        ],
+        [
+            State(f"order-{i}", "value"),
+            State(f"resample-freq-{i}", "value"),
+            State(f"rolling-periods-{i}", "value"),
+            State(f"chg-diff-period-{i}", "value"),
+            State(f"real-dates-{i}", "start_date"),
+            State(f"rebase-dates-{i}", "start_date"),
+            State(f"rebase-dates-{i}", "end_date"),
+            State(f"query-window-{i}", "data"),
+        ],
     )
-    def store_query_data(table, indicator):
+    def store_query_data(
+        table,
+        indicator,
+        chart_start,
+        chart_end,
+        order,
+        resample_freq,
+        rolling_periods,
+        chg_diff_period,
+        real_start,
+        rebase_start,
+        rebase_end,
+        window,
+    ):
         if not table or not indicator:
-            return {}, {}
+            return {}, {}, None
+        params = {
+            "resample_freq": resample_freq,
+            "rolling_periods": rolling_periods,
+            "chg_diff_period": chg_diff_period,
+            "real_start": real_start,
+            "rebase_start": rebase_start,
+            "rebase_end": rebase_end,
+        }
         if "*" in indicator:
             indicator = "*"
-        data = sqlutil.read(con=db.engine, table_name=table, cols=indicator)
-        metadata = data.columns.to_frame()
-        data.columns = data.columns.get_level_values(0)
-        data.reset_index(inplace=True)
-        return data.to_dict("records"), metadata.to_dict("records")
+        start_date, end_date = needed_window(table, chart_start, chart_end, order, **params)
+        if (
+            window
+            and window["table"] == table
+            and window["indicator"] == indicator
+            and utils.window_covers(window, start_date, end_date)
+        ):
+            # The stored read already spans the new dates, update_chart narrows what is shown.
+            raise PreventUpdate
+        data = data_cache.read(
+            con=read_db.engine,
+            table_name=table,
+            cols=indicator,
+            start_date=start_date,
+            end_date=end_date,
+        )
+        window = {"table": table, "indicator": indicator, "start": start_date, "end": end_date}
+        return *transport.encode(data), window
 
     @app.callback(
         [
             Output(f"data-transformed-{i}", "data"),
             Output(f"metadata-transformed-{i}", "data"),
+            Output(f"job-{i}", "data"),
+            Output(f"job-interval-{i}", "disabled"),
         ],
         [
             Input(f"real-dates-{i}", "start_date"),
@@ -558,6 +582,13 @@ def register_tabs_callbacks(app, i: int):
             Input(f"data-{i}", "data"),
             Input(f"metadata-{i}", "data"),
         ],
+        [
+            State(f"table-{i}", "value"),
+            State(f"indicator-{i}", "value"),
+            State("chart-dates", "start_date"),
+            State("chart-dates", "end_date"),
+            State(f"query-window-{i}", "data"),
+        ],
     )
     def store_transformed_data(
         real_start,
@@ -576,11 +607,16 @@ def register_tabs_callbacks(app, i: int):
         order,
         query_data,
         query_metadata,
+        table,
+        indicator,
+        chart_start,
+        chart_end,
+        window,
     ):
         if not order:
-            return query_data, query_metadata
+            return query_data, query_metadata, None, True
         if not query_data:
-            return {}, {}
+            return {}, {}, None, True
         if (
             ("resample" in order and (not resample_freq or not resample_operation))
             or ("rolling" in order and (not rolling_periods or not rolling_operation))
@@ -589,40 +625,98 @@ def register_tabs_callbacks(app, i: int):
             or ("decompose" in order and (not decompose_method or not decompose_component))
         ):
             raise PreventUpdate
-        data = pd.DataFrame.from_records(query_data, coerce_float=True, index="index")
-        data.index = pd.to_datetime(data.index)
-        metadata = pd.DataFrame.from_records(query_metadata)
-        data.columns = pd.MultiIndex.from_frame(metadata)
-        p = Pipeline(location=db.engine, download=False)
-
-        transformations = {
-            "usd": lambda x: convert_usd(x, pipeline=p, errors="ignore"),
-            "real": lambda x: convert_real(
-                x, start_date=real_start, end_date=real_end, pipeline=p, errors="ignore"
-            ),
-            "gdp": lambda x: convert_gdp(x, pipeline=p, errors="ignore"),
-            "resample": lambda x: resample(x, rule=resample_freq, operation=resample_operation),
-            "rolling": lambda x: rolling(x, window=rolling_periods, operation=rolling_operation),
-            "chg-diff": lambda x: chg_diff(
-                x, operation=chg_diff_operation, period=chg_diff_period
-            ),
-            "rebase": lambda x: rebase(
-                x, start_date=rebase_start, end_date=rebase_end, base=rebase_base
-            ),
-            "decompose": lambda x: decompose(
-                x,
-                component=decompose_component,
-                method=decompose_method,
-                force_x13=True,
-                errors="ignore",
-            ),
+        window_params = {
+            "resample_freq": resample_freq,
+            "rolling_periods": rolling_periods,
+            "chg_diff_period": chg_diff_period,
+            "real_start": real_start,
+            "rebase_start": rebase_start,
+            "rebase_end": rebase_end,
         }
-        transformed_data = data.copy()
-        for t in order:
-            transformed_data = transformations[t](transformed_data)
+        start_date, end_date = needed_window(table, chart_start, chart_end, order, **window_params)
+        if utils.window_covers(window, start_date, end_date):
+            data = transport.decode(query_data, query_metadata)
+        else:
+            # The order changed after the read and needs more history than data-{i} holds.
+            data = data_cache.read(
+                con=read_db.engine,
+                table_name=table,
+                cols="*" if "*" in indicator else indicator,
+                start_date=start_date,
+                end_date=end_date,
+            )
+        params = {
+            "real_start": real_start,
+            "real_end": real_end,
+            "resample_freq": resample_freq,
+            "resample_operation": resample_operation,
+            "rolling_periods": rolling_periods,
+            "rolling_operation": rolling_operation,
+            "chg_diff_operation": chg_diff_operation,
+            "chg_diff_period": chg_diff_period,
+            "rebase_start": rebase_start,
+            "rebase_end": rebase_end,
+            "rebase_base": rebase_base,
+            "decompose_method": decompose_method,
+            "decompose_component": decompose_component,
+        }
+        if job_queue.enabled and jobs.is_heavy(
+            data, order, params, con=read_db.engine, table=table, indicators=indicator
+        ):
+            job_id = jobs.submit(data, order, params, table=table, indicators=indicator)
+            return no_update, no_update, {"id": job_id}, False
+        transformed_data = transformations.apply_order(
+            data, order, params, con=read_db.engine, table=table, indicators=indicator
+        )
 
-        transformed_metadata = transformed_data.columns.to_frame()
-        transformed_data.columns = transformed_data.columns.get_level_values(0)
-        transformed_data.reset_index(inplace=True)
+        return *transport.encode(transformed_data), None, True
 
-        return transformed_data.to_dict("records"), transformed_metadata.to_dict("records")
+    @app.callback(
+        [
+            Output(f"data-transformed-{i}", "data", allow_duplicate=True),
+            Output(f"metadata-transformed-{i}", "data", allow_duplicate=True),
+            Output(f"job-interval-{i}", "disabled", allow_duplicate=True),
+            Output(f"job-progress-{i}", "value"),
+            Output(f"job-progress-{i}", "label"),
+            Output(f"job-progress-{i}", "style"),
+        ],
+        [Input(f"job-interval-{i}", "n_intervals")],
+        [State(f"job-{i}", "data")],
+        prevent_initial_call=True,
+    )
+    def poll_transformation_job(n, job):
+        hidden = {"display": "none"}
+        if not job:
+            return no_update, no_update, True, 0, "", hidden
+        status = job_queue.status(job["id"])
+        if status is None:
+            raise PreventUpdate
+        if status["state"] == "pending" and job_queue.expire(job["id"]):
+            return (
+                no_update,
+                no_update,
+                True,
+                100,
+                "Tiempo de espera agotado, intentá de nuevo más tarde",
+                {"display": "flex"},
+            )
+        if status["state"] == "done":
+            data = frame_store.get(status["result"])
+            if data is not None:
+                return *transport.encode(data), True, 100, "", hidden
+        elif status["state"] != "failed":
+            value = 100 * status["progress"] / max(status["total"], 1)
+            label = (
+                "En cola"
+                if status["state"] == "pending"
+                else f"{status['progress']}/{status['total']}"
+            )
+            return no_update, no_update, False, value, label, {"display": "flex"}
+        return (
+            no_update,
+            no_update,
+            True,
+            100,
+            "Error al transformar los datos",
+            {"display": "flex"},
+        )
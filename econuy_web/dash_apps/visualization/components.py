@@ -5,11 +5,34 @@ from dash import dcc
 from dash import html
 import dash_daq as daq
 
-from econuy_web.app_strings import table_options
+from econuy_web import catalog
+from econuy_web.cache import data_cache
 from econuy_web.dash_apps.querystrings import apply_qs
 from econuy_web.dash_apps.general_components import NAVBAR, FOOTER
 
 
+# (catalog version, layout), replaced as a whole so threads never see a half-updated entry.
+_default_layout = (None, None)
+
+
+def default_layout():
+    """
+    Layout for the page without a querystring.
+
+    Built once per catalog version and shared by every request, so it can be
+    warmed before gunicorn forks its workers.
+    """
+    global _default_layout
+    from econuy_web.database import read_db
+
+    version = data_cache.version(read_db.engine, catalog.CATALOG_TABLE)
+    cached_version, layout = _default_layout
+    if layout is None or cached_version != version:
+        layout = build_layout({})
+        _default_layout = (version, layout)
+    return layout
+
+
 def build_layout(params):
     return html.Div(
         [
@@ -145,10 +168,33 @@ def build_layout(params):
                         className="text-center mb-2",
                         md=2,
                     ),
+                    dbc.Col(
+                        html.A(
+                            dbc.Button(
+                                "Descargar CSV",
+                                id="csv-button",
+                                color="primary",
+                                disabled=True,
+                            ),
+                            id="csv-link",
+                        ),
+                        className="text-center mb-2",
+                        md=2,
+                    ),
                     dbc.Col(
                         dbc.Button(
-                            "Descargar CSV",
-                            id="csv-button",
+                            "Descargar Parquet",
+                            id="parquet-button",
+                            color="primary",
+                            disabled=True,
+                        ),
+                        className="text-center mb-2",
+                        md=2,
+                    ),
+                    dbc.Col(
+                        dbc.Button(
+                            "Descargar Feather",
+                            id="feather-button",
                             color="primary",
                             disabled=True,
                         ),
@@ -158,7 +204,6 @@ def build_layout(params):
                     dbc.Col(
                         [
                             dcc.Clipboard(
-                                target_id="html-div",
                                 id="clipboard",
                                 className="d-inline btn btn-primary disabled",
                             ),
@@ -172,9 +217,10 @@ def build_layout(params):
                 justify="center",
                 className="mx-0 mx-md-3",
             ),
-            html.Div(id="html-div", hidden=True),
             dcc.Download(id="download-data-csv"),
             dcc.Download(id="download-data-xlsx"),
+            dcc.Download(id="download-data-parquet"),
+            dcc.Download(id="download-data-feather"),
             metadata_notes(),
             html.Div(id="dummy"),
             html.Br(),
@@ -184,6 +230,9 @@ def build_layout(params):
 
 
 def form_builder(i: int, params):
+    from econuy_web.database import read_db
+
+    table_options = catalog.table_options(read_db.engine)
     table_indicator = dbc.Card(
         [
             dbc.CardHeader(html.H6("Seleccionar indicadores"), className="p-2"),
@@ -798,6 +847,14 @@ def form_builder(i: int, params):
                 "Las transformaciones se aplican empezando por la izquierda.",
                 color="secondary",
             ),
+            dbc.Progress(
+                id=f"job-progress-{i}",
+                value=0,
+                striped=True,
+                animated=True,
+                className="mt-2",
+                style={"display": "none"},
+            ),
         ]
     )
 
@@ -908,8 +965,11 @@ def data_storage(i: int):
         [
             dcc.Store(id=f"data-{i}"),
             dcc.Store(id=f"metadata-{i}"),
+            dcc.Store(id=f"query-window-{i}"),
             dcc.Store(id=f"data-transformed-{i}"),
             dcc.Store(id=f"metadata-transformed-{i}"),
+            dcc.Store(id=f"job-{i}"),
+            dcc.Interval(id=f"job-interval-{i}", interval=1000, disabled=True),
         ]
     )
 
@@ -0,0 +1,62 @@
+import json
+from typing import TYPE_CHECKING, BinaryIO, Iterator
+
+import pandas as pd
+
+if TYPE_CHECKING:
+    import pyarrow
+
+
+CHUNK_ROWS = 5000
+
+
+def iter_csv(data: pd.DataFrame, chunk_rows: int = CHUNK_ROWS) -> Iterator[bytes]:
+    """
+    CSV export of ``data`` in chunks of ``chunk_rows`` rows.
+
+    The output is identical to ``data.to_csv()`` encoded as latin-1, metadata
+    header rows included, but only one chunk is rendered at a time.
+    """
+    yield data.iloc[:0].to_csv().encode("latin1")
+    for start in range(0, len(data), chunk_rows):
+        yield data.iloc[start : start + chunk_rows].to_csv(header=False).encode("latin1")
+
+
+def write_csv(data: pd.DataFrame, buffer: BinaryIO):
+    for chunk in iter_csv(data):
+        buffer.write(chunk)
+
+
+def to_arrow(data: pd.DataFrame) -> "pyarrow.Table":
+    """
+    Arrow table with one field per indicator and the date index as "Fecha".
+
+    Each field carries its metadata levels (Tipo, Unidad, Moneda, etc.) as field
+    metadata, and the schema keeps all of them as JSON records under "econuy".
+    pyarrow is only imported here, since it is only needed for downloads.
+    """
+    import pyarrow as pa
+
+    metadata = data.columns.to_frame(index=False).astype(str)
+    records = metadata.to_dict("records")
+    flat = data.rename_axis("Fecha").reset_index()
+    # Built column by column, since indicator names need not be unique.
+    arrays = [pa.array(flat.iloc[:, i]) for i in range(flat.shape[1])]
+    fields = [pa.field("Fecha", arrays[0].type)] + [
+        pa.field(str(name), array.type, metadata=record)
+        for name, array, record in zip(data.columns.get_level_values(0), arrays[1:], records)
+    ]
+    schema = pa.schema(fields, metadata={"econuy": json.dumps(records)})
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def write_parquet(data: pd.DataFrame, buffer: BinaryIO):
+    import pyarrow.parquet as pq
+
+    pq.write_table(to_arrow(data), buffer)
+
+
+def write_feather(data: pd.DataFrame, buffer: BinaryIO):
+    import pyarrow.feather as feather
+
+    feather.write_feather(to_arrow(data), buffer)
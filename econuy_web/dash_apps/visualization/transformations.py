@@ -0,0 +1,172 @@
+import hashlib
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+from econuy.transform import (
+    chg_diff,
+    convert_usd,
+    convert_real,
+    convert_gdp,
+    resample,
+    rolling,
+    rebase,
+    decompose,
+)
+from sqlalchemy.engine.base import Engine
+
+from econuy_web.cache import (
+    CONVERSION_TABLES,
+    CachedPipeline,
+    data_cache,
+    frame_digest,
+    transform_cache,
+)
+from econuy_web.frame_store import x13_cache
+
+
+def step_params(step: str, params: Dict) -> tuple:
+    """Parameters that determine the output of a single transformation step."""
+    keys = {
+        "usd": [],
+        "real": ["real_start", "real_end"],
+        "gdp": [],
+        "resample": ["resample_freq", "resample_operation"],
+        "rolling": ["rolling_periods", "rolling_operation"],
+        "chg-diff": ["chg_diff_operation", "chg_diff_period"],
+        "rebase": ["rebase_start", "rebase_end", "rebase_base"],
+        "decompose": ["decompose_method", "decompose_component"],
+    }[step]
+    return tuple(params.get(key) for key in keys)
+
+
+def build_transformations(params: Dict, pipeline: CachedPipeline) -> Dict:
+    return {
+        "usd": lambda x: convert_usd(x, pipeline=pipeline, errors="ignore"),
+        "real": lambda x: convert_real(
+            x,
+            start_date=params["real_start"],
+            end_date=params["real_end"],
+            pipeline=pipeline,
+            errors="ignore",
+        ),
+        "gdp": lambda x: convert_gdp(x, pipeline=pipeline, errors="ignore"),
+        "resample": lambda x: resample(
+            x, rule=params["resample_freq"], operation=params["resample_operation"]
+        ),
+        "rolling": lambda x: rolling(
+            x, window=params["rolling_periods"], operation=params["rolling_operation"]
+        ),
+        "chg-diff": lambda x: chg_diff(
+            x, operation=params["chg_diff_operation"], period=params["chg_diff_period"]
+        ),
+        "rebase": lambda x: rebase(
+            x,
+            start_date=params["rebase_start"],
+            end_date=params["rebase_end"],
+            base=params["rebase_base"],
+        ),
+        "decompose": lambda x: cached_decompose(
+            x, component=params["decompose_component"], method=params["decompose_method"]
+        ),
+    }
+
+
+def x13_key(column: pd.DataFrame, component: str, method: str) -> str:
+    """``x13_cache`` key of a single decomposed column."""
+    digest = hashlib.sha1(frame_digest(column).encode())
+    digest.update(f"{method}|{component}".encode())
+    return digest.hexdigest()
+
+
+def cached_decompose(data: pd.DataFrame, component: str, method: str) -> pd.DataFrame:
+    """
+    ``decompose`` with X13 results persisted to disk one column at a time.
+
+    Each column is keyed by its values, index and metadata plus the method and
+    component, so the same series is only run through the X13 binary once per
+    host, no matter which worker or which combination of indicators asks for it.
+    """
+    if method != "x13" or not x13_cache.enabled:
+        return decompose(data, component=component, method=method, force_x13=True, errors="ignore")
+    output = []
+    for i in range(data.shape[1]):
+        column = data.iloc[:, [i]]
+        key = x13_key(column, component=component, method=method)
+        decomposed = x13_cache.get(key)
+        if decomposed is None:
+            decomposed = decompose(
+                column, component=component, method=method, force_x13=True, errors="ignore"
+            )
+            x13_cache.put(decomposed, key=key)
+        output.append(decomposed)
+    return pd.concat(output, axis=1)
+
+
+def prefix_keys(
+    data: pd.DataFrame,
+    order: Sequence[str],
+    params: Dict,
+    con: Engine,
+    table: Optional[str] = None,
+    indicators: Union[str, List[str], None] = None,
+) -> List[tuple]:
+    """``transform_cache`` keys of every prefix of ``order``, see ``apply_order``."""
+    if isinstance(indicators, str):
+        indicators = [indicators]
+    base = (table, tuple(indicators or []), frame_digest(data))
+    keys = []
+    prefix = ()
+    for step in order:
+        prefix = prefix + ((step, step_params(step, params)),)
+        if step in CONVERSION_TABLES:
+            aux = CONVERSION_TABLES[step]
+            prefix = prefix + ((aux, data_cache.version(con, aux)),)
+        keys.append(base + prefix)
+    return keys
+
+
+def longest_cached_prefix(data: pd.DataFrame, keys: List[tuple]) -> Tuple[int, pd.DataFrame]:
+    """Number of steps already cached and their output, or ``data`` if none are."""
+    for n in range(len(keys), 0, -1):
+        cached = transform_cache.get(keys[n - 1])
+        if cached is not None:
+            return n, cached
+    return 0, data
+
+
+def apply_order(
+    data: pd.DataFrame,
+    order: Sequence[str],
+    params: Dict,
+    con: Engine,
+    table: Optional[str] = None,
+    indicators: Union[str, List[str], None] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> pd.DataFrame:
+    """
+    Apply the transformations in ``order``, reusing cached intermediate results.
+
+    Every prefix of the chain is cached under the table, indicators, input
+    data, the prefix steps and their parameters. Changing a later step then
+    resumes from the longest cached prefix instead of starting over. Prefixes
+    with currency, inflation or GDP conversions also depend on the version of
+    the conversion tables, so a data refresh invalidates them.
+
+    ``progress`` is called with the number of completed and total steps.
+    """
+    keys = prefix_keys(data, order, params, con=con, table=table, indicators=indicators)
+    done, transformed = longest_cached_prefix(data, keys)
+    transformed = transformed.copy()
+    if done < len(order):
+        transformations = build_transformations(
+            params, CachedPipeline(location=con, download=False)
+        )
+        for n, (step, key) in enumerate(zip(order[done:], keys[done:]), start=done + 1):
+            if progress is not None:
+                progress(n - 1, len(order))
+            transformed = transformations[step](transformed)
+            transform_cache.set(key, transformed.copy())
+    if progress is not None:
+        progress(len(order), len(order))
+
+    return transformed
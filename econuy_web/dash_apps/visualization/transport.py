@@ -0,0 +1,51 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+from dash.exceptions import PreventUpdate
+
+from econuy_web.frame_store import frame_store
+
+
+def encode(data: pd.DataFrame) -> Tuple[Dict, List[Dict]]:
+    """
+    Columnar encoding of a dataframe for ``dcc.Store``.
+
+    Returns the data payload, with the index as epoch milliseconds and one
+    value list per column, and the column metadata as records. With
+    server-side stores enabled the frame stays on the server and the payload
+    only holds its key.
+    """
+    if frame_store.enabled:
+        return {"key": frame_store.put(data)}, []
+    if isinstance(data.columns, pd.MultiIndex):
+        metadata = data.columns.to_frame(index=False)
+        names = data.columns.get_level_values(0)
+    else:
+        metadata = pd.DataFrame({"Indicador": data.columns})
+        names = data.columns
+    values = data.to_numpy(dtype="float64").T
+    values_json = values.astype(object)
+    values_json[np.isnan(values)] = None
+    payload = {
+        "index": (pd.DatetimeIndex(data.index).asi8 // 10**6).tolist(),
+        "columns": names.tolist(),
+        "values": values_json.tolist(),
+    }
+    return payload, metadata.to_dict("records")
+
+
+def decode(payload: Dict, metadata_records: List[Dict]) -> pd.DataFrame:
+    """Rebuild a dataframe with MultiIndex columns from ``encode`` output."""
+    if "key" in payload:
+        data = frame_store.get(payload["key"])
+        if data is None:
+            raise PreventUpdate
+        return data
+    index = pd.to_datetime(np.asarray(payload["index"], dtype="int64"), unit="ms")
+    values = np.array(payload["values"], dtype="float64").reshape(
+        len(payload["columns"]), len(index)
+    )
+    data = pd.DataFrame(values.T, index=index)
+    data.columns = pd.MultiIndex.from_frame(pd.DataFrame.from_records(metadata_records))
+    return data
@@ -1,21 +1,17 @@
-import re
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence, Tuple
 from collections import Counter
 from econuy import transform
 
-# from econuy.utils import datasets
-from econuy.utils.operations import DATASETS
-
 import pandas as pd
+from pandas.tseries.frequencies import to_offset
+
+from econuy_web import catalog
 
 
 def get_labels(tables: List[str]) -> List[str]:
-    all_tables = {k: v["description"] for k, v in DATASETS.items()}
-    label_tables = []
-    for table in tables:
-        label_tables.append(all_tables[table])
-    label_tables = [re.sub(r" \(([^)]+)\)$", "", table) for table in label_tables]
-    return label_tables
+    from econuy_web.database import read_db
+
+    return catalog.labels(read_db.engine, tables)
 
 
 def dedup_colnames(dfs: List[pd.DataFrame], tables: List[str]) -> Dict[str, pd.DataFrame]:
@@ -74,3 +70,96 @@ def concat(dfs: List[pd.DataFrame]) -> List[pd.DataFrame]:
                 continue
 
     return combined
+
+
+def periods_offset(freq: str, periods: int):
+    """Date span covered by ``periods`` periods of ``freq``.
+
+    Irregular and daily series get two calendar days per period, which covers
+    business-day series with holidays.
+    """
+    try:
+        if freq in ["-", "D", "B", "C"]:
+            raise ValueError
+        return to_offset(freq) * periods
+    except ValueError:
+        return pd.Timedelta(days=2 * periods)
+
+
+def query_window(
+    start_date: Optional[str],
+    end_date: Optional[str],
+    order: Optional[Sequence[str]],
+    freq: Optional[str],
+    resample_freq: Optional[str] = None,
+    rolling_periods: Optional[int] = None,
+    chg_diff_period: Optional[str] = None,
+    real_start: Optional[str] = None,
+    rebase_start: Optional[str] = None,
+    rebase_end: Optional[str] = None,
+) -> Tuple[Optional[str], Optional[str]]:
+    """Dates to read so that ``order`` yields the same values inside the chart window.
+
+    Every step that looks back in time widens the start of the window by the
+    history it consumes, measured in the frequency the data has at that step.
+    Steps whose output depends on the whole sample disable the pushdown, and
+    so does an unknown ``freq``, since the lookback can't be measured.
+    """
+    if not start_date and not end_date:
+        return None, None
+    if freq is None:
+        return None, None
+    order = order or []
+    if "decompose" in order:
+        return None, None
+    start = pd.Timestamp(start_date) if start_date else None
+    end = pd.Timestamp(end_date) if end_date else None
+    if start is not None:
+        start = start - periods_offset(freq, 1)
+    for step in order:
+        lookback = []
+        if step == "chg-diff":
+            lookback = [periods_offset(freq, 1)]
+            if chg_diff_period == "inter":
+                lookback.append(pd.DateOffset(years=1))
+            elif chg_diff_period == "annual":
+                lookback.append(pd.DateOffset(years=2))
+        elif step == "rolling" and rolling_periods:
+            lookback = [periods_offset(freq, int(rolling_periods))]
+        elif step == "gdp":
+            lookback = [pd.DateOffset(years=1)]
+        elif step == "resample" and resample_freq:
+            freq = resample_freq
+            lookback = [periods_offset(freq, 1)]
+            if end is not None:
+                end = end + periods_offset(freq, 1)
+        elif step == "real" and real_start and start is not None:
+            start = min(start, pd.Timestamp(real_start))
+        elif step == "rebase":
+            if rebase_start and start is not None:
+                start = min(start, pd.Timestamp(rebase_start))
+            if rebase_end and end is not None:
+                end = max(end, pd.Timestamp(rebase_end))
+            elif rebase_start and end is not None:
+                end = max(end, pd.Timestamp(rebase_start))
+        if start is not None:
+            for offset in lookback:
+                start = start - offset
+
+    return (
+        start.strftime("%Y-%m-%d") if start is not None else None,
+        end.strftime("%Y-%m-%d") if end is not None else None,
+    )
+
+
+def window_covers(
+    window: Optional[Dict], start_date: Optional[str], end_date: Optional[str]
+) -> bool:
+    """Whether a read of ``window`` includes every date between ``start_date`` and ``end_date``."""
+    if not window:
+        return False
+    if window["start"] is not None and (start_date is None or start_date < window["start"]):
+        return False
+    if window["end"] is not None and (end_date is None or end_date > window["end"]):
+        return False
+    return True
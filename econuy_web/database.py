@@ -0,0 +1,110 @@
+import time
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine.base import Engine
+from sqlalchemy.pool import QueuePool
+
+
+class CheckoutStats(object):
+    """Thread-safe counters of how long callers waited for a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float, timed_out: bool = False):
+        with self._lock:
+            self.checkouts += 1
+            self.timeouts += timed_out
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "mean_wait": self.total_wait / self.checkouts if self.checkouts else 0.0,
+                "max_wait": self.max_wait,
+            }
+
+
+checkout_stats = CheckoutStats()
+
+
+class TimedQueuePool(QueuePool):
+    """``QueuePool`` that records the time spent waiting for each checkout."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except Exception:
+            checkout_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        checkout_stats.record(time.perf_counter() - start)
+        return connection
+
+
+class ReadEngine(object):
+    """
+    Pooled engine for the web read path.
+
+    Dash callbacks read through this engine instead of ``db.engine``, so a
+    burst of requests queues on a bounded pool rather than competing with
+    ``update.py`` and ``clear.py`` for connections. It connects to
+    ``READ_DATABASE_URL`` when set, e.g. a read replica, and to the main
+    database otherwise. On Postgres every session is read-only and statements
+    are cancelled after ``READ_STATEMENT_TIMEOUT`` milliseconds.
+    """
+
+    def __init__(self):
+        self._engine = None
+
+    def init_app(self, app):
+        url = app.config.get("READ_DATABASE_URL") or app.config["SQLALCHEMY_DATABASE_URI"]
+        if not url:
+            return
+        connect_args = {}
+        if url.startswith(("postgres", "postgresql")):
+            options = ["-c default_transaction_read_only=on"]
+            timeout = app.config.get("READ_STATEMENT_TIMEOUT")
+            if timeout:
+                options.append(f"-c statement_timeout={int(timeout)}")
+            connect_args["options"] = " ".join(options)
+        self._engine = create_engine(
+            url,
+            poolclass=TimedQueuePool,
+            pool_size=app.config.get("READ_POOL_SIZE", 5),
+            max_overflow=app.config.get("READ_MAX_OVERFLOW", 5),
+            pool_timeout=app.config.get("READ_POOL_TIMEOUT", 30),
+            pool_recycle=app.config.get("READ_POOL_RECYCLE", -1),
+            pool_pre_ping=app.config.get("READ_POOL_PRE_PING", True),
+            connect_args=connect_args,
+        )
+
+    @property
+    def engine(self) -> Optional[Engine]:
+        return self._engine
+
+    def status(self) -> Dict:
+        if self._engine is None:
+            return {}
+        pool = self._engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+            **checkout_stats.snapshot(),
+        }
+
+
+read_db = ReadEngine()
@@ -0,0 +1,131 @@
+import os
+import re
+import stat
+import time
+import pickle
+import hashlib
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+KEY_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+
+
+def private_directory(path: Path) -> Path:
+    """
+    Create ``path`` only accessible by this user, or check that an existing one is safe.
+
+    Stores unpickle whatever they find in their directory, so one that another
+    user owns or can write to would let them run code in the app.
+    """
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise PermissionError(f"{path} is not a directory.")
+    if hasattr(os, "getuid") and (info.st_uid != os.getuid() or info.st_mode & 0o022):
+        raise PermissionError(f"{path} must be owned by this user and writable only by it.")
+    return path
+
+
+class FrameStore(object):
+    """
+    Disk-backed store for dataframes shared by every worker on the host.
+
+    Frames are keyed by a hash of their content, so identical results map to
+    the same file. Files not read or written for ``ttl`` seconds are evicted.
+    Unless configured, frames live under the app's instance folder, in a
+    directory only the app's user can write to (see ``private_directory``).
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        ttl: float = 3600,
+        enabled: bool = False,
+        config_prefix: str = "FRAME_STORE",
+        enabled_key: str = "SERVER_SIDE_STORES",
+        name: str = "frames",
+    ):
+        self.directory = Path(directory or Path(tempfile.gettempdir(), f"econuy_web_{name}"))
+        self.ttl = ttl
+        self.enabled = enabled
+        self.config_prefix = config_prefix
+        self.enabled_key = enabled_key
+        self.name = name
+        self._checked = None
+        self._last_eviction = 0.0
+
+    def init_app(self, app):
+        self.directory = Path(
+            app.config.get(f"{self.config_prefix}_DIR") or Path(app.instance_path, self.name)
+        )
+        self.ttl = app.config.get(f"{self.config_prefix}_TTL", self.ttl)
+        self.enabled = app.config.get(self.enabled_key, self.enabled)
+
+    def ensure_directory(self) -> Path:
+        if self._checked != self.directory:
+            private_directory(self.directory)
+            self._checked = self.directory
+        return self.directory
+
+    def path(self, key: str) -> Path:
+        if not KEY_PATTERN.match(key):
+            raise KeyError(key)
+        return self.directory / f"{key}.pkl"
+
+    def put(self, data: "pd.DataFrame", key: Optional[str] = None) -> str:
+        content = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        key = key or hashlib.sha1(content).hexdigest()
+        path = self.path(key)
+        self.ensure_directory()
+        if path.exists():
+            os.utime(path)
+        else:
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        self.evict()
+        return key
+
+    def get(self, key: str) -> Optional["pd.DataFrame"]:
+        try:
+            path = self.path(key)
+            self.ensure_directory()
+            with open(path, "rb") as f:
+                data = pickle.load(f)
+        except (KeyError, FileNotFoundError):
+            return None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            # Evicted by another worker after we read it.
+            pass
+        return data
+
+    def evict(self, force: bool = False):
+        now = time.time()
+        if not force and now - self._last_eviction < self.ttl / 10:
+            return
+        self._last_eviction = now
+        for path in self.directory.glob("*.pkl"):
+            try:
+                if now - path.stat().st_mtime > self.ttl:
+                    path.unlink()
+            except FileNotFoundError:
+                continue
+
+
+frame_store = FrameStore()
+# X13 decompositions are slow and deterministic, so they are kept for much longer.
+x13_cache = FrameStore(
+    ttl=30 * 24 * 3600,
+    enabled=True,
+    config_prefix="X13_CACHE",
+    enabled_key="X13_CACHE_ENABLED",
+    name="x13",
+)
@@ -0,0 +1,332 @@
+import os
+import re
+import json
+import time
+import uuid
+import pickle
+import tempfile
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from econuy_web.frame_store import frame_store, private_directory
+
+
+JOB_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+STATES = ["pending", "running", "status"]
+
+
+class JobQueue(object):
+    """
+    Local disk-backed queue for slow visualizer transformations.
+
+    Web workers write the job's input under ``pending/`` and poll its status
+    file. ``python -m econuy_web.jobs`` claims jobs by moving them to
+    ``running/`` (an atomic rename, so several worker processes can share the
+    queue), runs them in a bounded process pool and stores the result in
+    ``frame_store``. Jobs no worker claims within ``timeout`` seconds are
+    expired, so pages don't wait on a queue nobody is serving. Inputs are
+    pickled, so like ``FrameStore`` the queue lives under the instance
+    folder unless configured, in a directory only the app's user can write.
+    """
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        enabled: bool = False,
+        workers: int = 2,
+        ttl: float = 3600,
+        timeout: float = 60,
+        heavy_cells: int = 2_000_000,
+    ):
+        self.directory = Path(directory or Path(tempfile.gettempdir(), "econuy_web_jobs"))
+        self.enabled = enabled
+        self.workers = workers
+        self.ttl = ttl
+        self.timeout = timeout
+        self.heavy_cells = heavy_cells
+        self._checked = None
+
+    def init_app(self, app):
+        self.directory = Path(app.config.get("JOBS_DIR") or Path(app.instance_path, "jobs"))
+        self.enabled = app.config.get("BACKGROUND_JOBS", self.enabled)
+        self.workers = app.config.get("JOB_WORKERS", self.workers)
+        self.ttl = app.config.get("FRAME_STORE_TTL", self.ttl)
+        self.timeout = app.config.get("JOB_QUEUE_TIMEOUT", self.timeout)
+        self.heavy_cells = app.config.get("JOB_HEAVY_CELLS", self.heavy_cells)
+
+    def ensure_directory(self) -> Path:
+        if self._checked != self.directory:
+            private_directory(self.directory)
+            self._checked = self.directory
+        return self.directory
+
+    def path(self, state: str, job_id: str) -> Path:
+        if not JOB_PATTERN.match(job_id):
+            raise KeyError(job_id)
+        suffix = "json" if state == "status" else "pkl"
+        return self.directory / state / f"{job_id}.{suffix}"
+
+    def _write(self, path: Path, content: bytes):
+        self.ensure_directory()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp, path)
+
+    def submit(self, payload: Dict) -> str:
+        job_id = uuid.uuid4().hex
+        self.set_status(job_id, state="pending", progress=0, total=len(payload["order"]))
+        self._write(
+            self.path("pending", job_id), pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL)
+        )
+        return job_id
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        try:
+            with open(self.path("status", job_id), "r") as f:
+                return json.load(f)
+        except (KeyError, FileNotFoundError, ValueError):
+            return None
+
+    @contextmanager
+    def _locked(self, job_id: str):
+        """Serialize status updates of a job across processes, where ``fcntl`` is available."""
+        if fcntl is None:
+            yield
+            return
+        path = self.ensure_directory() / "status" / f"{job_id}.lock"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def set_status(self, job_id: str, **fields):
+        path = self.path("status", job_id)
+        with self._locked(job_id):
+            status = self.status(job_id) or {}
+            status.update(fields)
+            self._write(path, json.dumps(status).encode())
+
+    def expire(self, job_id: str) -> bool:
+        """
+        Fail a job that has been pending for longer than ``timeout``.
+
+        Removing the input is what expires the job, and it races safely with
+        ``claim``: whichever of the two gets the file first wins.
+        """
+        path = self.path("pending", job_id)
+        try:
+            if time.time() - path.stat().st_mtime <= self.timeout:
+                return False
+            path.unlink()
+        except FileNotFoundError:
+            return False
+        self.set_status(job_id, state="failed", error="timeout")
+        return True
+
+    def claim(self) -> Optional[str]:
+        pending = self.directory / "pending"
+        if not pending.exists():
+            return None
+        (self.ensure_directory() / "running").mkdir(parents=True, exist_ok=True)
+        # Files can go at any point, expired or claimed by another worker.
+        queued = []
+        for path in pending.glob("*.pkl"):
+            try:
+                queued.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        for _, path in sorted(queued):
+            try:
+                os.rename(path, self.path("running", path.stem))
+            except (KeyError, FileNotFoundError):
+                continue
+            return path.stem
+        return None
+
+    def load(self, job_id: str) -> Dict:
+        self.ensure_directory()
+        with open(self.path("running", job_id), "rb") as f:
+            return pickle.load(f)
+
+    def finish(self, job_id: str, result: Optional[str] = None, error: Optional[str] = None):
+        if error is None:
+            self.set_status(job_id, state="done", result=result)
+        else:
+            self.set_status(job_id, state="failed", error=error)
+        self.path("running", job_id).unlink(missing_ok=True)
+
+    def requeue(self, job_id: str):
+        os.replace(self.path("running", job_id), self.path("pending", job_id))
+
+    def recover(self):
+        """Requeue jobs left in ``running/`` by a worker that did not shut down cleanly."""
+        running = self.directory / "running"
+        if not running.exists():
+            return
+        (self.directory / "pending").mkdir(parents=True, exist_ok=True)
+        for path in running.glob("*.pkl"):
+            os.replace(path, self.path("pending", path.stem))
+
+    def evict(self):
+        """Remove files older than ``ttl``, except those of jobs still running."""
+        now = time.time()
+        running = {path.stem for path in (self.directory / "running").glob("*.pkl")}
+        for state in STATES:
+            for path in (self.directory / state).glob("*.*"):
+                if path.stem in running:
+                    continue
+                try:
+                    if now - path.stat().st_mtime > self.ttl:
+                        path.unlink()
+                except FileNotFoundError:
+                    continue
+
+
+job_queue = JobQueue()
+
+
+def is_heavy(
+    data,
+    order: Sequence[str],
+    params: Dict,
+    con,
+    table: str,
+    indicators: List[str],
+) -> bool:
+    """
+    Whether a transformation chain is slow enough to run outside the request.
+
+    Chains already in ``transform_cache`` are never heavy. Otherwise the cost
+    is driven by X13 runs, one per column not in ``x13_cache``, and by the
+    number of cells pushed through the remaining steps.
+    """
+    from econuy_web.frame_store import x13_cache
+    from econuy_web.dash_apps.visualization import transformations
+
+    keys = transformations.prefix_keys(
+        data, order, params, con=con, table=table, indicators=indicators
+    )
+    done, transformed = transformations.longest_cached_prefix(data, keys)
+    remaining = order[done:]
+    if not remaining:
+        return False
+    if "decompose" in remaining and params.get("decompose_method") == "x13":
+        if not x13_cache.enabled or remaining[0] != "decompose":
+            # The input to X13 isn't known until the steps before it run.
+            return True
+        for i in range(transformed.shape[1]):
+            key = transformations.x13_key(
+                transformed.iloc[:, [i]],
+                component=params.get("decompose_component"),
+                method="x13",
+            )
+            if x13_cache.get(key) is None:
+                return True
+    return data.size * len(remaining) > job_queue.heavy_cells
+
+
+def submit(data, order: List[str], params: Dict, table: str, indicators: List[str]) -> str:
+    return job_queue.submit(
+        {"data": data, "order": order, "params": params, "table": table, "indicators": indicators}
+    )
+
+
+def _init_worker():
+    from econuy_web import create_app
+    from econuy_web.cache import init_caches
+
+    app = create_app(web=False)
+    app.app_context().push()
+    init_caches(app)
+
+
+def run_job(job_id: str):
+    from econuy_web.database import read_db
+    from econuy_web.dash_apps.visualization import transformations
+
+    payload = job_queue.load(job_id)
+    try:
+        data = transformations.apply_order(
+            payload["data"],
+            payload["order"],
+            payload["params"],
+            con=read_db.engine,
+            table=payload["table"],
+            indicators=payload["indicators"],
+            progress=lambda done, total: job_queue.set_status(
+                job_id, state="running", progress=done, total=total
+            ),
+        )
+        job_queue.finish(job_id, result=frame_store.put(data))
+    except Exception:
+        job_queue.finish(job_id, error=traceback.format_exc())
+
+    return
+
+
+def work():
+    """
+    Run queued jobs until interrupted, at most ``job_queue.workers`` at a time.
+
+    A pool process that dies, for instance killed for running out of memory,
+    breaks the whole pool. The jobs it was running are failed and a new pool
+    is started, so one bad job doesn't stop the worker.
+    """
+    job_queue.recover()
+    pool = ProcessPoolExecutor(max_workers=job_queue.workers, initializer=_init_worker)
+    running = {}
+    try:
+        while True:
+            broken = False
+            while len(running) < job_queue.workers and not broken:
+                job_id = job_queue.claim()
+                if job_id is None:
+                    break
+                try:
+                    running[pool.submit(run_job, job_id)] = job_id
+                except BrokenProcessPool:
+                    job_queue.requeue(job_id)
+                    broken = True
+            if running:
+                done, _ = wait(running, timeout=0.5, return_when=FIRST_COMPLETED)
+                for future in done:
+                    job_id = running.pop(future)
+                    try:
+                        future.result()
+                    except BrokenProcessPool:
+                        job_queue.finish(job_id, error=traceback.format_exc())
+                        broken = True
+            elif not broken:
+                job_queue.evict()
+                time.sleep(0.5)
+            if broken:
+                for job_id in running.values():
+                    job_queue.finish(job_id, error="worker pool restarted")
+                running = {}
+                pool.shutdown(wait=False, cancel_futures=True)
+                pool = ProcessPoolExecutor(max_workers=job_queue.workers, initializer=_init_worker)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+if __name__ == "__main__":
+    # Go through the package module so that the queue configured by create_app is the one used.
+    from econuy_web import create_app, jobs
+
+    app = create_app(web=False)
+    app.app_context().push()
+    jobs.work()
@@ -0,0 +1,304 @@
+import time
+import hashlib
+import datetime as dt
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+import pandas as pd
+from econuy import Pipeline
+from econuy.utils import sql as sqlutil
+from econuy.utils.operations import DATASETS
+from sqlalchemy import create_engine, inspect as sqla_inspect
+from sqlalchemy.engine.base import Connection, Engine
+
+from econuy_web.cache import frame_digest
+
+
+MANIFEST_TABLE = "econuy_web_manifest"
+# Datasets built from other datasets, and the datasets they read. econuy doesn't declare
+# these, so they are kept here and checked against DATASETS by check_dependencies. Any
+# dataset not listed is downloaded from its source. Keep in sync when upgrading econuy;
+# tests/test_refresh.py checks this against what each dataset's function reads.
+DEPENDENCIES = {
+    "core_industrial_production": {"industrial_production"},
+    "national_accounts_supply_constant_nsa_extended": {"national_accounts_supply_constant_nsa"},
+    "national_accounts_demand_constant_nsa_extended": {"national_accounts_demand_constant_nsa"},
+    "gdp_index_constant_sa_extended": {"gdp_index_constant_sa"},
+    "gdp_constant_nsa_extended": {"national_accounts_supply_constant_nsa"},
+    "gdp_current_nsa_extended": {"national_accounts_supply_current_nsa"},
+    "_monthly_interpolated_gdp": {"gdp_current_nsa_extended", "nxr_monthly"},
+    "fiscal_balance_summary": {
+        "fiscal_balance_central_government",
+        "fiscal_balance_global_public_sector",
+        "fiscal_balance_nonfinancial_public_sector",
+        "fiscal_balance_soe",
+    },
+    "net_public_debt_global_public_sector": {
+        "international_reserves",
+        "public_assets",
+        "public_debt_global_public_sector",
+    },
+    "labor_rates_persons": {"labor_rates"},
+    "real_wages": {"nominal_wages", "cpi"},
+    "balance_of_payments_summary": {"balance_of_payments"},
+    "trade_balance": {"trade_exports_destination_value", "trade_imports_origin_value"},
+    "terms_of_trade": {"trade_exports_destination_price", "trade_imports_origin_price"},
+    "regional_embi_yields": {"regional_embi_spreads"},
+}
+# Datasets that read other datasets but also download data of their own, such as the IMF
+# series rxr_custom gets through econuy.retrieval.regional._ifs. They are refreshed as
+# sources, so a change in what they download is never missed.
+DOWNLOADS_OWN_DATA = {"commodity_index", "regional_rxr", "rxr_custom"}
+
+
+def available_datasets() -> Dict[str, Dict]:
+    return {name: metadata for name, metadata in DATASETS.items() if not metadata["disabled"]}
+
+
+def check_dependencies(graph: Optional[Dict[str, Set[str]]] = None):
+    """Raise if a dataset in ``graph`` is unknown to econuy, for instance after a rename upstream."""
+    graph = DEPENDENCIES if graph is None else graph
+    names = set(graph).union(*graph.values(), DOWNLOADS_OWN_DATA)
+    unknown = sorted(names - set(DATASETS))
+    if unknown:
+        raise ValueError(f"Datasets in DEPENDENCIES not found in econuy: {', '.join(unknown)}.")
+    both = sorted(set(graph) & DOWNLOADS_OWN_DATA)
+    if both:
+        raise ValueError(
+            f"Datasets in both DEPENDENCIES and DOWNLOADS_OWN_DATA: {', '.join(both)}."
+        )
+
+    return
+
+
+def dependencies(name: str) -> Set[str]:
+    """Datasets that ``name`` is built from, see ``DEPENDENCIES``."""
+    return set(DEPENDENCIES.get(name, set()))
+
+
+def build_order(names: Iterable[str], graph: Dict[str, Set[str]]) -> List[str]:
+    """Order ``names`` and everything they depend on so that dependencies come first."""
+    order = []
+    visiting = set()
+
+    def visit(name: str):
+        if name in order or name in visiting:
+            return
+        visiting.add(name)
+        for dependency in sorted(graph.get(name, set())):
+            visit(dependency)
+        visiting.discard(name)
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+
+def inputs_digest(inputs: Iterable[str], manifest: Dict[str, Dict]) -> Optional[str]:
+    """Hash of the stored hashes of ``inputs``, so a dataset can tell what it was built from."""
+    inputs = sorted(inputs)
+    if not inputs:
+        return None
+    hashes = [f"{name}:{manifest.get(name, {}).get('hash')}" for name in inputs]
+    return hashlib.sha1("\n".join(hashes).encode()).hexdigest()
+
+
+def read_manifest(con: Union[Connection, Engine]) -> Dict[str, Dict]:
+    if not sqla_inspect(con).has_table(MANIFEST_TABLE):
+        return {}
+    manifest = pd.read_sql(sql=MANIFEST_TABLE, con=con)
+    return manifest.set_index("name").to_dict("index")
+
+
+def write_manifest(con: Union[Connection, Engine], manifest: Dict[str, Dict]):
+    pd.DataFrame.from_dict(manifest, orient="index").rename_axis("name").reset_index().to_sql(
+        name=MANIFEST_TABLE, con=con, if_exists="replace", index=False
+    )
+
+    return
+
+
+def compute(con: Engine, name: str, graph: Dict[str, Set[str]]) -> pd.DataFrame:
+    """
+    Build one dataset without writing it.
+
+    Source datasets are downloaded. Datasets built from other datasets are
+    recomputed from the stored copies of their inputs, which were refreshed
+    earlier in the same run.
+    """
+    if graph.get(name):
+        return DATASETS[name]["function"](pipeline=Pipeline(location=con, download=False))
+    p = Pipeline(location=con, download=True, always_save=False)
+    p.get(name)
+    return p.dataset
+
+
+def process(
+    con: Engine, name: str, graph: Dict[str, Set[str]], previous_hash: Optional[str], full: bool
+) -> Tuple[str, Optional[str], float]:
+    """Compute one dataset and write it if it changed. Returns status, hash and seconds taken."""
+    start = time.perf_counter()
+    try:
+        data = compute(con, name, graph)
+    except Exception as error:
+        print(f"{name}: failed with {error!r}.")
+        return "failed", None, time.perf_counter() - start
+    digest = frame_digest(data)
+    if not full and previous_hash == digest:
+        return "skipped", digest, time.perf_counter() - start
+    try:
+        sqlutil.df_to_sql(data, name=name, con=con)
+    except Exception as error:
+        print(f"{name}: failed to write with {error!r}.")
+        return "failed", None, time.perf_counter() - start
+    return "refreshed", digest, time.perf_counter() - start
+
+
+_engine = None
+
+
+def _init_worker():
+    # Read the URL here rather than receive it, so credentials never go through pickled arguments.
+    from config import Config
+
+    global _engine
+    _engine = create_engine(Config.SQLALCHEMY_DATABASE_URI)
+
+
+def _process_in_worker(name, graph, previous_hash, full):
+    return process(_engine, name, graph, previous_hash, full)
+
+
+def refresh(
+    con: Engine,
+    names: Optional[Iterable[str]] = None,
+    full: bool = False,
+    workers: int = 1,
+) -> Dict:
+    """
+    Refresh datasets, writing only the ones whose content changed.
+
+    Every result is hashed and compared with ``MANIFEST_TABLE``, which is
+    updated as soon as each dataset is written. Unchanged datasets are not
+    rewritten. Datasets built from other datasets also keep the hashes of
+    the inputs they were built from, and are only recomputed when those
+    differ from the stored ones, so one that failed is retried on the next
+    run. ``full`` recomputes and rewrites everything.
+
+    With more than one worker, datasets run in a process pool as soon as
+    everything they depend on is done, each process with its own engine to
+    the configured ``DATABASE_URL``. A pool process that dies fails the
+    datasets it was running and the pool is replaced.
+
+    Datasets whose inputs failed are failed without being built.
+
+    Returns the names of refreshed, skipped and failed datasets and the
+    seconds spent on each.
+    """
+    check_dependencies()
+    available = available_datasets()
+    graph = {name: dependencies(name) for name in available}
+    order = build_order(available if names is None else names, graph)
+    pending = {name: graph.get(name, set()) & set(order) for name in order}
+    manifest = read_manifest(con)
+    report = {"refreshed": [], "skipped": [], "failed": [], "seconds": {}}
+
+    def record(name: str, status: str, digest: Optional[str], seconds: float):
+        report[status].append(name)
+        report["seconds"][name] = seconds
+        if digest is not None:
+            entry = dict(manifest.get(name, {}))
+            if status == "refreshed" or "refreshed_at" not in entry:
+                entry["refreshed_at"] = dt.datetime.now(dt.timezone.utc).isoformat()
+            entry.update(hash=digest, inputs=inputs_digest(graph.get(name, set()), manifest))
+            if entry != manifest.get(name):
+                manifest[name] = entry
+                # Written right away, so a later failure doesn't lose what was already stored.
+                write_manifest(con, manifest)
+        print(f"{name}: {status} ({seconds:.1f}s).")
+        for dependents in pending.values():
+            dependents.discard(name)
+
+    def should_skip(name: str) -> bool:
+        inputs = graph.get(name, set())
+        return (
+            not full
+            and bool(inputs)
+            and name in manifest
+            and manifest[name].get("inputs") == inputs_digest(inputs, manifest)
+        )
+
+    def ready() -> List[str]:
+        names = [name for name in order if name in pending and not pending[name]]
+        for name in names:
+            pending.pop(name)
+        return names
+
+    def new_pool() -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=workers, initializer=_init_worker)
+
+    def replace_pool(pool: ProcessPoolExecutor) -> ProcessPoolExecutor:
+        # Everything still running in a broken pool is lost with it.
+        for name in running.values():
+            print(f"{name}: failed, the process pool broke.")
+            record(name, "failed", None, 0.0)
+        running.clear()
+        pool.shutdown(wait=False, cancel_futures=True)
+        return new_pool()
+
+    running = {}
+    pool = new_pool() if workers > 1 else None
+    try:
+        while pending or running:
+            for name in ready():
+                failed_inputs = graph.get(name, set()) & set(report["failed"])
+                if failed_inputs:
+                    print(f"{name}: not built, {', '.join(sorted(failed_inputs))} failed.")
+                    record(name, "failed", None, 0.0)
+                    continue
+                if should_skip(name):
+                    record(name, "skipped", None, 0.0)
+                    continue
+                previous_hash = manifest.get(name, {}).get("hash")
+                if pool is None:
+                    record(name, *process(con, name, graph, previous_hash, full))
+                    continue
+                try:
+                    future = pool.submit(_process_in_worker, name, graph, previous_hash, full)
+                except BrokenProcessPool:
+                    pool = replace_pool(pool)
+                    future = pool.submit(_process_in_worker, name, graph, previous_hash, full)
+                running[future] = name
+            if running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                broken = False
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as error:
+                        print(f"{name}: failed with {error!r}.")
+                        record(name, "failed", None, 0.0)
+                        broken = broken or isinstance(error, BrokenProcessPool)
+                    else:
+                        record(name, *result)
+                if broken:
+                    pool = replace_pool(pool)
+            elif pending and all(pending.values()):
+                # A dependency cycle: none of what is left can become ready.
+                for name in list(pending):
+                    pending.pop(name)
+                    record(name, "failed", None, 0.0)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    print(
+        f"Refreshed {len(report['refreshed'])}, skipped {len(report['skipped'])}, "
+        f"failed {len(report['failed'])} in {sum(report['seconds'].values()):.1f}s of work."
+    )
+    if report["skipped"]:
+        print(f"Skipped: {', '.join(report['skipped'])}")
+
+    return report
@@ -1,7 +1,11 @@
 from sqlalchemy import inspect
-from flask import render_template
+from flask import Response, abort, jsonify, render_template, stream_with_context
 from flask import current_app as app
 
+from econuy_web.database import read_db
+from econuy_web.frame_store import frame_store
+from econuy_web.dash_apps.visualization.exports import iter_csv
+
 
 @app.route("/", methods=["GET", "POST"])
 def landing():
@@ -11,3 +15,23 @@ def landing():
 @app.route("/sobre", methods=["GET"])
 def about():
     return render_template("about.html")
+
+
+@app.route("/download/<key>.csv", methods=["GET"])
+def download_csv(key):
+    data = frame_store.get(key)
+    if data is None:
+        abort(404)
+    return Response(
+        stream_with_context(iter_csv(data)),
+        mimetype="text/csv",
+        headers={"Content-Disposition": "attachment; filename=econuy-data.csv"},
+    )
+
+
+@app.route("/status/pool", methods=["GET"])
+def pool_status():
+    # No auth, so only served when POOL_STATUS_ENABLED is set.
+    if not app.config["POOL_STATUS_ENABLED"]:
+        abort(404)
+    return jsonify(read_db.status())
@@ -9,28 +9,58 @@ from econuy.session import Session
 from econuy.utils import sql as sqlutil
 
 from econuy_web import db, create_app
+from econuy_web.cache import bump_versions, init_caches
+from econuy_web.catalog import CATALOG_TABLE, write_catalog
+from econuy_web.dash_apps.monitor.series import MONITOR_TABLE, materialize
+from econuy_web.refresh import refresh
+
+
+LABOR_SEAS_TABLE = "labor_rates_persons_seas"
+
+
+def labor_seas(s: Session):
+    s.decompose(component="trend", method="x13", force_x13=True, select="labor_rates_persons")
+    sqlutil.df_to_sql(
+        s.datasets["labor_rates_persons"],
+        name=LABOR_SEAS_TABLE,
+        con=db.engine,
+    )
+
+    return
+
 
 if __name__ == "__main__":
-    app = create_app()
+    app = create_app(web=False)
     app.app_context().push()
+    init_caches(app)
+    workers = app.config["REFRESH_WORKERS"]
+    args = []
+    for arg in sys.argv[1:]:
+        if arg.startswith("--workers="):
+            workers = int(arg.split("=", 1)[1])
+        else:
+            args.append(arg)
     s = Session(location=db.engine)
-    if len(sys.argv) == 1:
-        s.get_bulk("all")
-        s.get("_monthly_interpolated_gdp")
-        s.decompose(component="trend", method="x13", force_x13=True, select="labor_rates_persons")
-        sqlutil.df_to_sql(
-            s.datasets["labor_rates_persons"],
-            name="labor_rates_persons_seas",
-            con=db.engine,
-        )
-    elif sys.argv[1] == "labor_seas":
+    if not args or args[0] == "full":
+        # Incremental by default: unchanged datasets are skipped, see refresh.refresh.
+        full = bool(args)
+        report = refresh(db.engine, full=full, workers=workers)
+        updated = report["refreshed"]
+        if full or "labor_rates_persons" in updated:
+            s = Session(location=db.engine, download=False)
+            s.get("labor_rates_persons")
+            labor_seas(s)
+            updated.append(LABOR_SEAS_TABLE)
+    elif args[0] == "labor_seas":
         s.get("labor_rates_persons")
-        s.decompose(component="trend", method="x13", force_x13=True, select="labor_rates_persons")
-        sqlutil.df_to_sql(
-            s.datasets["labor_rates_persons"],
-            name="labor_rates_persons_seas",
-            con=db.engine,
-        )
+        labor_seas(s)
+        updated = list(s.datasets.keys()) + [LABOR_SEAS_TABLE]
     else:
-        for arg in sys.argv[1:]:
+        for arg in args:
             s.get(arg)
+        updated = list(s.datasets.keys())
+    if updated:
+        bump_versions(db.engine, updated)
+        write_catalog(db.engine)
+        materialize(db.engine)
+        bump_versions(db.engine, [CATALOG_TABLE, MONITOR_TABLE])
@@ -0,0 +1,33 @@
+def warm(app):
+    """
+    Load read-mostly state before gunicorn forks its workers.
+
+    The Dash apps are mounted if ``LAZY_DASH`` deferred them, and the dataset
+    catalog, the materialized monitor series and both default layouts are
+    built once in the master, so workers start with them in pages shared
+    copy-on-write instead of each loading them on its first request. Pooled
+    connections opened along the way are discarded, since they must not be
+    shared across processes.
+    """
+    from econuy_web import db
+    from econuy_web.catalog import get_catalog
+    from econuy_web.database import read_db
+    from econuy_web.dash_apps.mount import LazyDash
+    from econuy_web.dash_apps.monitor import components as monitor_components
+    from econuy_web.dash_apps.monitor.charts import CHARTS
+    from econuy_web.dash_apps.monitor.series import get_many
+    from econuy_web.dash_apps.visualization import components as visualization_components
+
+    if isinstance(app.wsgi_app, LazyDash):
+        app.wsgi_app.mount_all()
+    with app.app_context():
+        try:
+            get_catalog(read_db.engine)
+            get_many(read_db.engine, {spec["series"] for spec in CHARTS.values()})
+            visualization_components.default_layout()
+            monitor_components.default_layout()
+        finally:
+            read_db.engine.dispose()
+            db.engine.dispose()
+
+    return
@@ -0,0 +1,18 @@
+import gc
+import os
+
+# Build the app in the master and share it with workers, see econuy_web/warm.py.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "True") == "True"
+
+
+def when_ready(server):
+    if not preload_app:
+        return
+    from econuy_web.warm import warm
+
+    try:
+        warm(server.app.wsgi())
+    except Exception:
+        server.log.exception("Could not warm application state, workers will load it on demand.")
+    # Keep the collector from touching, and so copying, everything loaded so far.
+    gc.freeze()
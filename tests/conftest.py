@@ -0,0 +1,24 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+# config.py reads the environment on import, so this has to be set before anything imports it.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("QUERY_DATABASE_URL", "sqlite://")
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+
+@pytest.fixture(scope="session")
+def app():
+    """
+    The application, created once.
+
+    Routes are registered on ``current_app`` when their modules are first
+    imported, so only the first app created in a process has them.
+    """
+    pytest.importorskip("econuy")
+    from econuy_web import create_app
+
+    return create_app()
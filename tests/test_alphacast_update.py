@@ -0,0 +1,176 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("econuy")
+pytest.importorskip("alphacast")
+
+from econuy_web import alphacast_update
+
+
+class FakeDataset(object):
+    def __init__(self, client, dataset_id):
+        self.client = client
+        self.dataset_id = dataset_id
+
+    def initialize_columns(self, **kwargs):
+        self.client.calls.append(("initialize_columns", self.dataset_id))
+
+    def upload_data_from_df(self, df, deleteMissingFromDB, onConflictUpdateDB, uploadIndex):
+        if self.client.fail_uploads:
+            raise ConnectionError("connection reset")
+        self.client.uploads.append((df.copy(), deleteMissingFromDB))
+
+
+class FakeDatasets(object):
+    def __init__(self, client):
+        self.client = client
+
+    def create(self, name, repo_id, returnIdIfExists=False):
+        return {"id": 1}
+
+    def read_by_name(self, name):
+        return {"id": 1}
+
+    def dataset(self, dataset_id):
+        return FakeDataset(self.client, dataset_id)
+
+
+class FakeClient(object):
+    """Records what would be sent to Alphacast, see ``upload_dataset``."""
+
+    def __init__(self):
+        self.calls = []
+        self.uploads = []
+        self.fail_uploads = False
+        self.datasets = FakeDatasets(self)
+
+
+@pytest.fixture(autouse=True)
+def fingerprints(monkeypatch, tmp_path):
+    monkeypatch.setattr(alphacast_update, "FINGERPRINT_DIR", tmp_path)
+    monkeypatch.setattr(alphacast_update, "ALPHACAST_BACKOFF", 0)
+    monkeypatch.setattr(alphacast_update, "rate_limiter", alphacast_update.RateLimiter(0))
+    return tmp_path
+
+
+def dataset(values, dates=None) -> pd.DataFrame:
+    dates = dates or pd.date_range("2020-01-31", periods=len(values), freq="M")
+    data = pd.DataFrame({"Indicador": values}, index=pd.DatetimeIndex(dates))
+    data.columns = pd.MultiIndex.from_tuples(
+        [("Indicador", "Precios", "M")], names=["Indicador", "Área", "Frecuencia"]
+    )
+    return data
+
+
+def upload(client, data, **kwargs):
+    alphacast_update.upload_dataset(data, "name", 1, full_name="Test", client=client, **kwargs)
+
+
+def test_unchanged_dataset_is_not_uploaded():
+    client = FakeClient()
+    upload(client, dataset([1.0, 2.0, 3.0]))
+    assert len(client.uploads) == 1
+    upload(client, dataset([1.0, 2.0, 3.0]))
+    assert len(client.uploads) == 1
+
+
+def test_only_changed_rows_are_sent():
+    client = FakeClient()
+    upload(client, dataset([1.0, 2.0, 3.0]))
+    upload(client, dataset([1.0, 5.0, 3.0, 4.0]))
+    sent, delete_missing = client.uploads[-1]
+    assert not delete_missing
+    assert list(sent["Indicador"]) == [5.0, 4.0]
+
+
+def test_changed_rows_with_repeated_dates():
+    client = FakeClient()
+    dates = ["2020-01-31", "2020-01-31", "2020-02-29", "2020-03-31"]
+    upload(client, dataset([1.0, 1.0, 2.0, 3.0], dates=dates))
+    upload(client, dataset([1.0, 1.0, 2.0, 7.0], dates=dates))
+    sent, _ = client.uploads[-1]
+    assert list(sent["Indicador"]) == [7.0]
+    assert list(sent["Date"].dt.strftime("%Y-%m-%d")) == ["2020-03-31"]
+
+
+def test_fingerprint_written_only_after_successful_upload(fingerprints):
+    client = FakeClient()
+    client.fail_uploads = True
+    with pytest.raises(ConnectionError):
+        upload(client, dataset([1.0, 2.0]))
+    assert alphacast_update.read_fingerprint("Test") is None
+
+    client.fail_uploads = False
+    upload(client, dataset([1.0, 2.0]))
+    assert alphacast_update.read_fingerprint("Test") is not None
+    assert client.uploads[-1][1]
+
+
+def test_full_uploads_everything():
+    client = FakeClient()
+    upload(client, dataset([1.0, 2.0]))
+    upload(client, dataset([1.0, 2.0]), full=True)
+    assert len(client.uploads) == 2
+    assert len(client.uploads[-1][0]) == 2
+
+
+@pytest.mark.parametrize(
+    "error, retried",
+    [
+        (ConnectionError("reset"), True),
+        (TimeoutError(), True),
+        (Exception("503: Service unavailable"), True),
+        (Exception("API failed with status code 429"), True),
+        (Exception("403: Forbidden"), False),
+        (Exception("API failed with status code 404"), False),
+        (KeyError("id"), False),
+        (ValueError("Dataset already exists: 1"), False),
+    ],
+)
+def test_call_retries_only_transient_errors(error, retried):
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise error
+        return "ok"
+
+    if retried:
+        assert alphacast_update.call(flaky) == "ok"
+    else:
+        with pytest.raises(type(error)):
+            alphacast_update.call(flaky)
+    assert len(attempts) == (2 if retried else 1)
+
+
+class FakePipeline(object):
+    def get(self, name):
+        self.dataset = pd.DataFrame({"a": [1.0, 2.0, 3.0]})
+
+
+def double(data):
+    data *= 2
+    return data
+
+
+def add(data, n):
+    # Like econuy's transformations, changes its input in place.
+    data += n
+    return data
+
+
+def test_plans_sharing_a_prefix_match_running_alone(monkeypatch):
+    monkeypatch.setattr(alphacast_update, "get_pipeline", FakePipeline)
+    monkeypatch.setattr(alphacast_update, "STEPS", {"double": double, "add": add})
+    transformations = {
+        "doubled": {"base": "base", "steps": [("double", {})]},
+        "doubled plus 1": {"base": "base", "steps": [("double", {}), ("add", {"n": 1})]},
+        "doubled plus 10": {"base": "base", "steps": [("double", {}), ("add", {"n": 10})]},
+        "plus 1": {"base": "base", "steps": [("add", {"n": 1})]},
+    }
+    together = dict(alphacast_update.run_plan(alphacast_update.build_plan(transformations)))
+    for name, entry in transformations.items():
+        alone = dict(alphacast_update.run_plan(alphacast_update.build_plan({name: entry})))
+        pd.testing.assert_frame_equal(together[name], alone[name])
+    assert list(together["doubled plus 10"]["a"]) == [12.0, 14.0, 16.0]
@@ -0,0 +1,123 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("econuy")
+
+from sqlalchemy import create_engine
+
+from econuy_web import cache
+from econuy_web.cache import DataCache, LRUCache, bump_versions, frame_digest
+
+
+def frame(n: int, value: float = 1.0) -> pd.DataFrame:
+    return pd.DataFrame({"a": [value] * n}, index=pd.date_range("2000-01-01", periods=n))
+
+
+def test_lru_stays_within_byte_bound():
+    lru = LRUCache(max_bytes=100, sizeof=len)
+    lru.set("a", "x" * 40)
+    lru.set("b", "x" * 40)
+    lru.set("c", "x" * 40)
+    assert lru.nbytes <= 100
+    assert "a" not in lru
+    assert "b" in lru and "c" in lru
+
+
+def test_lru_evicts_least_recently_used():
+    lru = LRUCache(max_bytes=100, sizeof=len)
+    lru.set("a", "x" * 40)
+    lru.set("b", "x" * 40)
+    lru.get("a")
+    lru.set("c", "x" * 40)
+    assert "a" in lru
+    assert "b" not in lru
+
+
+def test_lru_skips_values_larger_than_bound():
+    lru = LRUCache(max_bytes=10, sizeof=len)
+    lru.set("a", "x" * 11)
+    assert "a" not in lru
+    assert lru.nbytes == 0
+
+
+def test_lru_replacing_a_key_updates_size():
+    lru = LRUCache(max_bytes=100, sizeof=len)
+    lru.set("a", "x" * 40)
+    lru.set("a", "x" * 10)
+    assert lru.nbytes == 10
+    assert len(lru) == 1
+
+
+def test_data_cache_reloads_after_version_bump():
+    con = create_engine("sqlite://")
+    data_cache = DataCache(version_ttl=0)
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return frame(3, value=len(loads))
+
+    first = data_cache.get_or_load(con, "table", ("table",), loader)
+    again = data_cache.get_or_load(con, "table", ("table",), loader)
+    assert len(loads) == 1
+    pd.testing.assert_frame_equal(first, again)
+
+    bump_versions(con, ["table"])
+    reloaded = data_cache.get_or_load(con, "table", ("table",), loader)
+    assert len(loads) == 2
+    assert reloaded["a"].iloc[0] == 2
+
+
+def test_data_cache_hands_out_copies():
+    con = create_engine("sqlite://")
+    data_cache = DataCache(version_ttl=0)
+    data_cache.get_or_load(con, "table", ("table",), lambda: frame(3))
+    data_cache.get_or_load(con, "table", ("table",), lambda: frame(3))["a"] = 0
+    assert (data_cache.get_or_load(con, "table", ("table",), lambda: frame(3))["a"] == 1).all()
+
+
+def test_frame_digest_depends_on_values_index_and_columns():
+    data = frame(3)
+    assert frame_digest(data) == frame_digest(data.copy())
+    assert frame_digest(data) != frame_digest(frame(3, value=2.0))
+    assert frame_digest(data) != frame_digest(data.rename(columns={"a": "b"}))
+    assert frame_digest(data) != frame_digest(data.shift(1, freq="D"))
+
+
+def test_cached_pipeline_falls_back_on_read_errors(monkeypatch):
+    con = create_engine("sqlite://")
+    fallbacks = []
+
+    def missing(*args, **kwargs):
+        raise ValueError("Table missing not found")
+
+    monkeypatch.setattr(cache.data_cache, "read", missing)
+    monkeypatch.setattr(cache.Pipeline, "get", lambda self, name: fallbacks.append(name))
+    cache.CachedPipeline(location=con, download=False).get("missing")
+    assert fallbacks == ["missing"]
+
+
+def test_cached_session_builds_cached_pipelines():
+    con = create_engine("sqlite://")
+    p = cache.CachedSession(location=con, download=False).pipeline
+    assert isinstance(p, cache.CachedPipeline)
+    assert p.location is con
+    assert p.download is False
+
+
+def test_data_cache_windows_share_one_entry(monkeypatch):
+    con = create_engine("sqlite://")
+    data_cache = DataCache(version_ttl=0)
+    reads = []
+
+    def read(con, table_name, cols=None, **kwargs):
+        reads.append(kwargs)
+        return frame(10)
+
+    monkeypatch.setattr(cache.sqlutil, "read", read)
+    window = data_cache.read(con, "table", start_date="2000-01-03", end_date="2000-01-05")
+    assert list(window.index.strftime("%Y-%m-%d")) == ["2000-01-03", "2000-01-04", "2000-01-05"]
+    assert len(data_cache.read(con, "table", start_date="2000-01-08")) == 3
+    assert len(data_cache.read(con, "table")) == 10
+    assert reads == [{}]
+    assert len(data_cache) == 1
@@ -0,0 +1,31 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("econuy")
+
+from sqlalchemy import create_engine
+
+from econuy_web import catalog
+
+
+@pytest.fixture
+def con(monkeypatch):
+    # Each test starts from an empty database and an empty per-worker catalog.
+    monkeypatch.setattr(catalog, "_catalog", None)
+    return create_engine("sqlite://")
+
+
+def test_labels_fall_back_to_table_name(con):
+    assert catalog.labels(con, ["not_in_catalog"]) == ["not_in_catalog"]
+
+
+def test_indicators_of_unknown_table_are_empty(con):
+    assert catalog.indicators(con, "not_in_catalog") == []
+
+
+def test_frequency_is_read_from_metadata_without_catalog(con):
+    pd.DataFrame({"Indicador": ["a"], "Frecuencia": ["M"]}).rename_axis("index").to_sql(
+        name="table_metadata", con=con
+    )
+    assert catalog.frequency(con, "table") == "M"
+    assert catalog.frequency(con, "missing") is None
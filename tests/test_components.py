@@ -0,0 +1,24 @@
+import pytest
+
+pytest.importorskip("econuy")
+
+from econuy_web import database
+from econuy_web.dash_apps.visualization import components
+
+
+def test_default_layout_is_rebuilt_per_catalog_version(monkeypatch):
+    version = {"value": "1"}
+    builds = []
+    monkeypatch.setattr(components, "_default_layout", (None, None))
+    monkeypatch.setattr(components.data_cache, "version", lambda con, table: version["value"])
+    monkeypatch.setattr(components, "build_layout", lambda params: builds.append(1) or object())
+    # No app is set up here, so read_db has no engine to hand out.
+    monkeypatch.setattr(database, "read_db", type("ReadDb", (), {"engine": None}))
+
+    first = components.default_layout()
+    assert components.default_layout() is first
+    version["value"] = "2"
+    second = components.default_layout()
+    assert second is not first
+    assert components.default_layout() is second
+    assert len(builds) == 2
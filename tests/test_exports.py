@@ -0,0 +1,55 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("econuy")
+
+from econuy_web.dash_apps.visualization import exports
+
+
+def frame(n: int) -> pd.DataFrame:
+    data = pd.DataFrame(
+        np.arange(2 * n, dtype="float64").reshape(n, 2) / 3,
+        index=pd.date_range("2000-01-31", periods=n, freq="M", name="Fecha"),
+    )
+    if n > 1:
+        data.iloc[1, 0] = np.nan
+    data.columns = pd.MultiIndex.from_tuples(
+        [("Índice de precios", "Flujo", "UYU"), ("Exportaciones", "Stock", "USD")],
+        names=["Indicador", "Tipo", "Moneda"],
+    )
+    return data
+
+
+@pytest.mark.parametrize("n, chunk_rows", [(10, 3), (10, 5), (10, 10), (10, 5000), (0, 3)])
+def test_iter_csv_matches_to_csv(n, chunk_rows):
+    data = frame(n)
+    streamed = b"".join(exports.iter_csv(data, chunk_rows=chunk_rows))
+    assert streamed == data.to_csv().encode("latin1")
+
+
+def test_iter_csv_flat_columns():
+    data = frame(7)
+    data.columns = data.columns.get_level_values(0)
+    assert b"".join(exports.iter_csv(data, chunk_rows=2)) == data.to_csv().encode("latin1")
+
+
+def test_write_csv():
+    data = frame(12)
+    buffer = io.BytesIO()
+    exports.write_csv(data, buffer)
+    assert buffer.getvalue() == data.to_csv().encode("latin1")
+
+
+def test_to_arrow_with_repeated_indicator_names():
+    pytest.importorskip("pyarrow")
+    data = frame(3)
+    data.columns = pd.MultiIndex.from_tuples(
+        [("Exportaciones", "Flujo", "UYU"), ("Exportaciones", "Stock", "USD")],
+        names=["Indicador", "Tipo", "Moneda"],
+    )
+    table = exports.to_arrow(data)
+    assert table.column_names == ["Fecha", "Exportaciones", "Exportaciones"]
+    assert [field.metadata[b"Moneda"] for field in list(table.schema)[1:]] == [b"UYU", b"USD"]
@@ -0,0 +1,49 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("econuy")
+
+from econuy_web.dash_apps import figures
+
+
+def test_lttb_returns_all_points_when_small():
+    x = np.arange(10, dtype="float64")
+    np.testing.assert_array_equal(figures.lttb(x, x, 20), np.arange(10))
+    np.testing.assert_array_equal(figures.lttb(x, x, 2), np.arange(10))
+
+
+def test_lttb_keeps_endpoints_and_order():
+    rng = np.random.default_rng(0)
+    x = np.arange(1000, dtype="float64")
+    y = rng.normal(size=1000).cumsum()
+    indices = figures.lttb(x, y, 100)
+    assert len(indices) == 100
+    assert indices[0] == 0 and indices[-1] == 999
+    assert (np.diff(indices) > 0).all()
+
+
+def test_lttb_keeps_spikes():
+    x = np.arange(1000, dtype="float64")
+    y = np.zeros(1000)
+    y[333] = 50
+    y[777] = -50
+    indices = figures.lttb(x, y, 50)
+    assert 333 in indices and 777 in indices
+
+
+def test_downsample_keeps_union_of_columns():
+    index = pd.date_range("2000-01-01", periods=500)
+    data = pd.DataFrame({"a": np.sin(np.arange(500) / 10), "b": np.nan}, index=index)
+    data.iloc[::2, 1] = np.cos(np.arange(250) / 5)
+    downsampled = figures.downsample(data, 50)
+    assert len(downsampled) < len(data)
+    assert downsampled.index.is_monotonic_increasing
+    assert downsampled.index[0] == index[0] and downsampled.index[-1] == index[-1]
+    assert downsampled["a"].notna().sum() >= 50
+    assert downsampled["b"].notna().sum() >= 50
+
+
+def test_downsample_leaves_short_frames_alone():
+    data = pd.DataFrame({"a": [1.0, 2.0]}, index=pd.date_range("2000-01-01", periods=2))
+    assert figures.downsample(data, 10) is data
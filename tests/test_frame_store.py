@@ -0,0 +1,45 @@
+import os
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("econuy")
+
+from econuy_web.frame_store import FrameStore, private_directory
+
+
+def test_get_tolerates_eviction_after_read(monkeypatch, tmp_path):
+    store = FrameStore(directory=str(tmp_path), enabled=True)
+    data = pd.DataFrame({"a": [1.0, 2.0]})
+    key = store.put(data)
+
+    def utime(path):
+        raise FileNotFoundError(path)
+
+    monkeypatch.setattr(os, "utime", utime)
+    pd.testing.assert_frame_equal(store.get(key), data)
+
+
+def test_get_missing_and_invalid_keys(tmp_path):
+    store = FrameStore(directory=str(tmp_path), enabled=True)
+    assert store.get("0" * 40) is None
+    assert store.get("../etc/passwd") is None
+
+
+def test_store_creates_a_private_directory(tmp_path):
+    store = FrameStore(directory=str(tmp_path / "frames"), enabled=True)
+    store.put(pd.DataFrame({"a": [1.0]}))
+    assert (tmp_path / "frames").stat().st_mode & 0o777 == 0o700
+
+
+def test_store_refuses_shared_directories(tmp_path):
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    store = FrameStore(directory=str(shared), enabled=True)
+    with pytest.raises(PermissionError):
+        store.get("0" * 40)
+    (tmp_path / "target").mkdir(mode=0o700)
+    (tmp_path / "link").symlink_to(tmp_path / "target")
+    with pytest.raises(PermissionError):
+        private_directory(tmp_path / "link")
@@ -0,0 +1,100 @@
+import os
+import sys
+import time
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("econuy")
+
+from sqlalchemy import create_engine
+
+from econuy_web import jobs
+from econuy_web.dash_apps.visualization import transformations
+from econuy_web.frame_store import FrameStore
+from econuy_web.jobs import JobQueue
+
+
+@pytest.fixture
+def queue(monkeypatch, tmp_path):
+    queue = JobQueue(directory=str(tmp_path), enabled=True, timeout=60, heavy_cells=1000)
+    monkeypatch.setattr(jobs, "job_queue", queue)
+    return queue
+
+
+def frame(n: int) -> pd.DataFrame:
+    return pd.DataFrame({"a": range(n)}, index=pd.date_range("2000-01-31", periods=n, freq="M"))
+
+
+def test_set_status_merges_fields(queue):
+    job_id = queue.submit({"order": ["rolling"]})
+    queue.set_status(job_id, state="running", progress=1)
+    assert queue.status(job_id) == {"state": "running", "progress": 1, "total": 1}
+
+
+def test_expire_only_stale_pending_jobs(queue):
+    job_id = queue.submit({"order": ["rolling"]})
+    assert not queue.expire(job_id)
+    old = time.time() - 120
+    os.utime(queue.path("pending", job_id), (old, old))
+    assert queue.expire(job_id)
+    assert queue.status(job_id)["state"] == "failed"
+    assert queue.claim() is None
+
+
+def test_claimed_jobs_do_not_expire(queue):
+    job_id = queue.submit({"order": ["rolling"]})
+    old = time.time() - 120
+    os.utime(queue.path("pending", job_id), (old, old))
+    assert queue.claim() == job_id
+    assert not queue.expire(job_id)
+
+
+def test_claim_skips_files_removed_during_the_scan(queue, monkeypatch):
+    gone = queue.submit({"order": ["rolling"]})
+    job_id = queue.submit({"order": ["rolling"]})
+    glob = type(queue.directory).glob
+
+    def vanishing_glob(self, pattern):
+        paths = list(glob(self, pattern))
+        queue.path("pending", gone).unlink(missing_ok=True)
+        return paths
+
+    monkeypatch.setattr(type(queue.directory), "glob", vanishing_glob)
+    assert queue.claim() == job_id
+
+
+def test_evict_keeps_running_jobs(queue):
+    running = queue.submit({"order": ["rolling"]})
+    assert queue.claim() == running
+    finished = queue.submit({"order": ["rolling"]})
+    queue.set_status(finished, state="done")
+    old = time.time() - 2 * queue.ttl
+    for path in queue.directory.glob("*/*.*"):
+        os.utime(path, (old, old))
+    queue.evict()
+    assert queue.path("running", running).exists()
+    assert queue.status(running) is not None
+    assert queue.status(finished) is None
+
+
+def test_is_heavy_by_size(queue):
+    con = create_engine("sqlite://")
+    params = {"rolling_periods": 3, "rolling_operation": "sum"}
+    assert not jobs.is_heavy(frame(10), ["rolling"], params, con, "table", ["a"])
+    assert jobs.is_heavy(frame(2000), ["rolling"], params, con, "table", ["a"])
+
+
+def test_is_heavy_skips_cached_x13_columns(monkeypatch, queue, tmp_path):
+    con = create_engine("sqlite://")
+    store = FrameStore(directory=str(tmp_path / "x13"), enabled=True)
+    # The package re-exports the frame_store instance under the submodule's name.
+    monkeypatch.setattr(sys.modules["econuy_web.frame_store"], "x13_cache", store)
+    data = frame(10)
+    params = {"decompose_method": "x13", "decompose_component": "seas"}
+    assert jobs.is_heavy(data, ["decompose"], params, con, "table", ["a"])
+    store.put(data, key=transformations.x13_key(data.iloc[:, [0]], component="seas", method="x13"))
+    assert not jobs.is_heavy(data, ["decompose"], params, con, "table", ["a"])
+    # X13 after another step runs on data that isn't known yet.
+    params.update({"rolling_periods": 3, "rolling_operation": "sum"})
+    assert jobs.is_heavy(data, ["rolling", "decompose"], params, con, "table", ["a"])
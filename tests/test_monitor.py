@@ -0,0 +1,72 @@
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("econuy")
+
+from econuy_web.dash_apps.monitor import series
+from econuy_web.dash_apps.monitor.charts import CHARTS
+
+
+def test_long_format_keeps_empty_columns():
+    data = pd.DataFrame(
+        {"a": [1.0, np.nan, 3.0], "b": [np.nan] * 3},
+        index=pd.date_range("2000-01-31", periods=3, freq="M"),
+    )
+    result = series.from_long(series.to_long("name", data))
+    expected = data.loc[data["a"].notna()]
+    pd.testing.assert_frame_equal(result, expected, check_freq=False)
+
+
+def test_get_many_leaves_out_series_that_fail(monkeypatch):
+    def fail(con):
+        raise RuntimeError("no data")
+
+    monkeypatch.setattr(series, "_series", {"ok": pd.DataFrame({"a": [1.0]})})
+    monkeypatch.setattr(series, "_series_version", None)
+    monkeypatch.setattr(series.data_cache, "version", lambda con, table: None)
+    monkeypatch.setitem(series.SERIES, "broken", fail)
+    assert list(series.get_many(None, ["ok", "broken"])) == ["ok"]
+
+
+def test_one_failing_chart_leaves_the_others(app, monkeypatch):
+    columns = ["a", "b"]
+    for spec in CHARTS.values():
+        y = spec.get("y")
+        named = ([] if y is None or callable(y) else list(y)) + [spec.get("extra_trace")]
+        columns += [column for column in named if column and column not in columns]
+    data = pd.DataFrame(
+        np.ones((12, len(columns))),
+        columns=columns,
+        index=pd.date_range("2020-01-31", periods=12, freq="M"),
+    )
+    names = {spec["series"] for spec in CHARTS.values()}
+    broken = CHARTS["chart-gdp"]["series"]
+    monkeypatch.setattr(
+        sys.modules["econuy_web.dash_apps.monitor.callbacks"],
+        "get_many",
+        lambda con, names: {name: data.copy() for name in names if name != broken},
+    )
+    outputs = [{"id": chart_id, "property": "figure"} for chart_id in CHARTS]
+    response = app.test_client().post(
+        "/monitor/_dash-update-component",
+        json={
+            "output": "..{}..".format("...".join(f"{chart_id}.figure" for chart_id in CHARTS)),
+            "outputs": outputs,
+            "inputs": [
+                {"id": "dates", "property": "start_date", "value": None},
+                {"id": "dates", "property": "end_date", "value": None},
+            ],
+            "state": [{"id": "viewport-width", "property": "data", "value": 1200}],
+            "changedPropIds": ["dates.start_date"],
+        },
+    )
+    assert response.status_code == 200
+    figures = response.json["response"]
+    assert figures["chart-gdp"]["figure"]["data"] == []
+    assert len(names) > 1
+    assert all(
+        figures[chart_id]["figure"]["data"] for chart_id in CHARTS if chart_id != "chart-gdp"
+    )
@@ -0,0 +1,81 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("econuy")
+
+# Routes are registered on the first app created in a process, so each mode gets its own.
+SCRIPT = """
+import json
+from flask import url_for
+from econuy_web import create_app
+from econuy_web.dash_apps.mount import LazyDash
+
+app = create_app()
+client = app.test_client()
+result = {}
+for path in ["/interactive/", "/interactive/_dash-layout", "/monitor/", "/monitor/_dash-layout",
+             "/sobre", "/missing"]:
+    response = client.get(path)
+    result[path] = [response.status_code, b"_dash-config" in response.data]
+if isinstance(app.wsgi_app, LazyDash):
+    server = app.wsgi_app.servers["/interactive/"]
+    with server.test_request_context("/interactive/"):
+        result["shared"] = [
+            server.error_handler_spec[None] == app.error_handler_spec[None],
+            set(app.extensions) <= set(server.extensions),
+            url_for("landing"),
+            url_for("landing", _external=True),
+        ]
+print(json.dumps(result))
+"""
+
+
+@pytest.fixture(scope="module", params=["False", "True"], ids=["eager", "lazy"])
+def served(request):
+    env = dict(os.environ, LAZY_DASH=request.param)
+    process = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=Path(__file__).parents[1],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(process.stdout.splitlines()[-1])
+
+
+@pytest.mark.parametrize("prefix", ["/interactive/", "/monitor/"])
+def test_dash_apps_are_served(served, prefix):
+    assert served[prefix] == [200, True]
+    assert served[f"{prefix}_dash-layout"][0] == 200
+
+
+def test_other_routes_still_served(served):
+    assert served["/sobre"][0] == 200
+    assert served["/missing"][0] == 404
+
+
+def test_lazy_servers_share_the_app_setup(served):
+    if "shared" not in served:
+        pytest.skip("Dash apps are mounted on the main app")
+    assert served["shared"] == [True, True, "/", "http://localhost/"]
+
+
+def test_bare_app_does_not_import_econuy():
+    script = (
+        "import sys; from econuy_web import create_app; create_app(web=False); "
+        "print([name for name in ['econuy', 'pandas'] if name in sys.modules])"
+    )
+    process = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert process.stdout.splitlines()[-1] == "[]"
@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("econuy")
+
+from econuy_web.dash_apps.visualization import utils
+
+
+def test_unknown_frequency_reads_full_table():
+    assert utils.query_window(
+        "2020-01-01", "2021-01-01", ["rolling"], None, rolling_periods=12
+    ) == (
+        None,
+        None,
+    )
+
+
+def test_lookback_widens_start():
+    start, end = utils.query_window(
+        "2020-06-01", "2021-01-01", ["rolling"], "M", rolling_periods=12
+    )
+    assert start < "2019-06-01"
+    assert end == "2021-01-01"
+
+
+def test_decompose_reads_full_table():
+    assert utils.query_window("2020-01-01", None, ["decompose"], "M") == (None, None)
+
+
+def test_window_covers():
+    window = {"start": "2019-01-01", "end": None}
+    assert utils.window_covers(window, "2020-01-01", "2021-01-01")
+    assert utils.window_covers(window, "2019-01-01", None)
+    assert not utils.window_covers(window, "2018-12-31", None)
+    assert not utils.window_covers(window, None, None)
+    assert not utils.window_covers({"start": None, "end": "2020-01-01"}, None, "2020-02-01")
+    assert not utils.window_covers(None, None, None)
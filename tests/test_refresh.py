@@ -0,0 +1,178 @@
+import os
+import re
+import inspect
+
+import pandas as pd
+import pytest
+
+pytest.importorskip("econuy")
+
+from sqlalchemy import create_engine
+
+from econuy_web import refresh
+
+
+def frame(value: float) -> pd.DataFrame:
+    return pd.DataFrame({"a": [value] * 3}, index=pd.date_range("2000-01-01", periods=3))
+
+
+@pytest.fixture
+def datasets(monkeypatch):
+    """Three sources, ``c`` built from ``a`` and ``b``, and ``d`` built from ``c``."""
+    graph = {"c": {"a", "b"}, "d": {"c"}}
+    names = ["a", "b", "c", "d"]
+    monkeypatch.setattr(refresh, "DATASETS", {name: {"disabled": False} for name in names})
+    monkeypatch.setattr(refresh, "DEPENDENCIES", graph)
+    monkeypatch.setattr(refresh, "DOWNLOADS_OWN_DATA", set())
+    values = {"a": 1.0, "b": 2.0}
+    computed, written = [], []
+
+    def value(name):
+        return values[name] if name in values else sum(value(x) for x in graph[name])
+
+    def compute(con, name, graph):
+        computed.append(name)
+        return frame(value(name))
+
+    monkeypatch.setattr(refresh, "compute", compute)
+    monkeypatch.setattr(refresh.sqlutil, "df_to_sql", lambda data, name, con: written.append(name))
+    return values, computed, written
+
+
+DATASET_READ = re.compile(r"""\.get\(\s*(?:name=)?["'](\w+)["']""")
+DOWNLOAD = re.compile(r"\b_ifs\(|\burls?\b|requests\.|read_(?:csv|excel|html)\(")
+
+
+def test_dependencies_match_econuy():
+    refresh.check_dependencies()
+    for name, metadata in refresh.DATASETS.items():
+        function = getattr(metadata["function"], "func", metadata["function"])
+        source = inspect.getsource(function)
+        reads = set(DATASET_READ.findall(source)) & set(refresh.DATASETS) - {name}
+        if name in refresh.DOWNLOADS_OWN_DATA:
+            assert reads and DOWNLOAD.search(source), name
+        elif reads:
+            assert refresh.DEPENDENCIES.get(name) == reads, name
+            assert not DOWNLOAD.search(source), f"{name} downloads data of its own"
+        else:
+            assert name not in refresh.DEPENDENCIES, name
+
+
+def test_build_order_puts_dependencies_first():
+    graph = {"c": {"a", "b"}, "d": {"c"}}
+    order = refresh.build_order(["d"], graph)
+    assert order == ["a", "b", "c", "d"]
+    assert refresh.build_order(["a", "d"], graph) == ["a", "b", "c", "d"]
+
+
+def test_build_order_terminates_on_cycles():
+    assert sorted(refresh.build_order(["a"], {"a": {"b"}, "b": {"a"}})) == ["a", "b"]
+
+
+def test_check_dependencies_fails_on_unknown_names(monkeypatch):
+    monkeypatch.setattr(refresh, "DATASETS", {"a": {}, "b": {}})
+    monkeypatch.setattr(refresh, "DOWNLOADS_OWN_DATA", {"b"})
+    refresh.check_dependencies({"a": {"b"}})
+    with pytest.raises(ValueError, match="missing"):
+        refresh.check_dependencies({"a": {"b", "missing"}})
+    with pytest.raises(ValueError, match="renamed"):
+        refresh.check_dependencies({"renamed": {"a"}})
+    with pytest.raises(ValueError, match="both"):
+        refresh.check_dependencies({"b": {"a"}})
+
+
+def test_refresh_skips_unchanged_datasets(datasets):
+    values, computed, written = datasets
+    con = create_engine("sqlite://")
+    report = refresh.refresh(con)
+    assert report["refreshed"] == ["a", "b", "c", "d"]
+    assert written == ["a", "b", "c", "d"]
+
+    computed.clear(), written.clear()
+    values["b"] = 10.0
+    report = refresh.refresh(con)
+    assert sorted(report["refreshed"]) == ["b", "c", "d"]
+    assert "a" in report["skipped"]
+    assert written == ["b", "c", "d"]
+
+    computed.clear(), written.clear()
+    report = refresh.refresh(con)
+    # Sources are always downloaded, datasets built from them only when an input changed.
+    assert computed == ["a", "b"]
+    assert written == []
+
+
+def test_refresh_fails_cycles(datasets, monkeypatch):
+    monkeypatch.setattr(refresh, "DEPENDENCIES", {"c": {"d"}, "d": {"c"}})
+    report = refresh.refresh(create_engine("sqlite://"))
+    assert sorted(report["failed"]) == ["c", "d"]
+    assert sorted(report["refreshed"]) == ["a", "b"]
+
+
+def test_manifest_keeps_entries_written_before_a_failure(datasets, monkeypatch):
+    con = create_engine("sqlite://")
+
+    def df_to_sql(data, name, con):
+        if name == "d":
+            raise RuntimeError("disk full")
+
+    monkeypatch.setattr(refresh.sqlutil, "df_to_sql", df_to_sql)
+    report = refresh.refresh(con)
+    assert report["failed"] == ["d"]
+    assert sorted(refresh.read_manifest(con)) == ["a", "b", "c"]
+
+
+def test_failures_fail_dependents(datasets, monkeypatch):
+    values, computed, written = datasets
+
+    def df_to_sql(data, name, con):
+        if name == "b":
+            raise RuntimeError("disk full")
+        written.append(name)
+
+    monkeypatch.setattr(refresh.sqlutil, "df_to_sql", df_to_sql)
+    report = refresh.refresh(create_engine("sqlite://"))
+    assert report["refreshed"] == ["a"]
+    assert report["failed"] == ["b", "c", "d"]
+    assert "c" not in computed and "d" not in computed
+
+
+def crash_on_b(name, graph, previous_hash, full):
+    if name == "b":
+        os._exit(1)
+    return "refreshed", name, 0.0
+
+
+def test_pool_survives_a_dying_process(datasets, monkeypatch, tmp_path):
+    monkeypatch.setattr(refresh, "_process_in_worker", crash_on_b)
+    monkeypatch.setattr(refresh, "DEPENDENCIES", {"c": {"a"}, "d": {"b"}})
+    report = refresh.refresh(create_engine(f"sqlite:///{tmp_path / 'db.sqlite'}"), workers=2)
+    assert "b" in report["failed"] and "d" in report["failed"]
+    assert sorted(report["refreshed"] + report["failed"]) == ["a", "b", "c", "d"]
+
+
+def test_failed_dependents_are_retried(datasets, monkeypatch):
+    values, computed, written = datasets
+    con = create_engine("sqlite://")
+    refresh.refresh(con)
+
+    def df_to_sql(data, name, con):
+        if name == "c":
+            raise RuntimeError("disk full")
+        written.append(name)
+
+    values["b"] = 10.0
+    monkeypatch.setattr(refresh.sqlutil, "df_to_sql", df_to_sql)
+    report = refresh.refresh(con)
+    assert report["failed"] == ["c", "d"]
+
+    computed.clear(), written.clear()
+    monkeypatch.setattr(refresh.sqlutil, "df_to_sql", lambda data, name, con: written.append(name))
+    report = refresh.refresh(con)
+    assert report["refreshed"] == ["c", "d"]
+    assert written == ["c", "d"]
+
+    computed.clear(), written.clear()
+    report = refresh.refresh(con)
+    assert computed == ["a", "b"]
+    assert written == []
@@ -0,0 +1,14 @@
+import pytest
+
+pytest.importorskip("econuy")
+
+
+def test_pool_status_is_off_by_default(app):
+    assert app.test_client().get("/status/pool").status_code == 404
+
+
+def test_pool_status_when_enabled(app, monkeypatch):
+    monkeypatch.setitem(app.config, "POOL_STATUS_ENABLED", True)
+    response = app.test_client().get("/status/pool")
+    assert response.status_code == 200
+    assert "checkouts" in response.json
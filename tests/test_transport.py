@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("econuy")
+
+from econuy_web.dash_apps.visualization import transport
+from econuy_web.frame_store import FrameStore
+
+
+def frame() -> pd.DataFrame:
+    data = pd.DataFrame(
+        [[1.5, np.nan], [np.nan, 2.0], [3.25, -4.0]],
+        index=pd.date_range("2020-01-31", periods=3, freq="M"),
+    )
+    data.columns = pd.MultiIndex.from_tuples(
+        [("Indicador 1", "Flujo", "UYU"), ("Indicador 2", "Stock", "USD")],
+        names=["Indicador", "Tipo", "Moneda"],
+    )
+    return data
+
+
+def test_round_trip():
+    data = frame()
+    payload, metadata = transport.encode(data)
+    decoded = transport.decode(payload, metadata)
+    pd.testing.assert_frame_equal(decoded, data, check_freq=False)
+
+
+def test_missing_values_are_json_null():
+    payload, _ = transport.encode(frame())
+    assert payload["values"][0][1] is None
+    assert payload["values"][1][0] is None
+
+
+def test_flat_columns_get_indicator_level():
+    data = pd.DataFrame({"a": [1.0, 2.0]}, index=pd.date_range("2020-01-01", periods=2))
+    decoded = transport.decode(*transport.encode(data))
+    assert list(decoded.columns.names) == ["Indicador"]
+    assert list(decoded.columns.get_level_values(0)) == ["a"]
+    np.testing.assert_array_equal(decoded.to_numpy(), data.to_numpy())
+
+
+def test_round_trip_through_frame_store(monkeypatch, tmp_path):
+    store = FrameStore(directory=str(tmp_path), enabled=True)
+    monkeypatch.setattr(transport, "frame_store", store)
+    data = frame()
+    payload, metadata = transport.encode(data)
+    assert list(payload) == ["key"]
+    pd.testing.assert_frame_equal(transport.decode(payload, metadata), data)